@@ -1,23 +1,37 @@
 import io
 import os
+import time
 import unicodedata
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, NamedTuple, Optional, Tuple
 from urllib.parse import quote_plus
 
 import numpy as np
 import pandas as pd
-import plotly.express as px
 import requests
 import streamlit as st
 
 from busca_dados import fetch_coord_data
+from components.figures import PayloadBudget, bar_figure, bar_grid, plot
+from lib import snapshot
+from lib.incremental import ALL, AggregateSnapshot, IncrementalAggregates, snapshot_from_facts
+from lib.search import SearchIndex, tokenize
 
 
 DEFAULT_SPREADSHEET = (
     "https://docs.google.com/spreadsheets/d/1pUa66-abnwnE0qQ_34YX4qFmLUtTnNIwk4Jm59OK_us/edit?gid=585129450#gid=585129450"
 )
 
+# Orçamento de payload (bytes de JSON Plotly enviados por rerun) de cada aba
+POS_PAYLOAD_BUDGET = 15_000
+INOV_PAYLOAD_BUDGET = 30_000
+
+# Com SNAPSHOT_DIR definido, os processos do Streamlit compartilham um snapshot Arrow
+# republicado a cada SNAPSHOT_TTL segundos (mesmo intervalo do cache da planilha)
+SNAPSHOT_TTL = 30
+# Tempo maximo de espera pela primeira publicacao na partida a frio
+SNAPSHOT_WAIT = 30
+
 
 def parse_int_series(s):
     """Converte série de strings para int, tratando valores inválidos."""
@@ -64,6 +78,291 @@ def _has_tokens(col_norm: str, *tokens: str) -> bool:
     return all(token in col_norm for token in tokens)
 
 
+def _detect_pos_columns(df: pd.DataFrame) -> Dict[str, Optional[str]]:
+    cols = dict.fromkeys(['unidade', 'denominacao', 'status', 'alunos', 'remuneracao'])
+    for col in df.columns:
+        col_lower = _normalize_col(col)
+        if 'unidade_pos' in col_lower or _has_tokens(col_lower, 'unidade', 'pos'):
+            cols['unidade'] = col
+        if 'denominacao_pos' in col_lower or _has_tokens(col_lower, 'denominacao', 'pos'):
+            cols['denominacao'] = col
+        if _has_tokens(col_lower, 'status', 'curso', 'pos') or _has_tokens(col_lower, 'status', 'pos'):
+            cols['status'] = col
+        if _has_tokens(col_lower, 'alunos', 'matriculados', 'pos') or _has_tokens(col_lower, 'alunos', 'pos'):
+            cols['alunos'] = col
+        if _has_tokens(col_lower, 'remuneracao', 'pos') or _has_tokens(col_lower, 'total', 'remuner', 'pos'):
+            cols['remuneracao'] = col
+    return cols
+
+
+def _detect_inov_columns(df: pd.DataFrame) -> Dict[str, Optional[str]]:
+    cols = dict.fromkeys(['ano', 'unidade', 'via', 'cidade', 'natureza', 'projeto'])
+    for col in df.columns:
+        col_lower = _normalize_col(col)
+        if col_lower == 'ano_inov' or _has_tokens(col_lower, 'ano', 'inov'):
+            cols['ano'] = col
+        if col_lower == 'unidade' or _has_tokens(col_lower, 'unidade', 'inov'):
+            cols['unidade'] = col
+        if col_lower == 'via_inov' or _has_tokens(col_lower, 'via', 'inov'):
+            cols['via'] = col
+        if col_lower == 'cidade' or _has_tokens(col_lower, 'cidade', 'inov'):
+            cols['cidade'] = col
+        if col_lower == 'natureza_inov' or _has_tokens(col_lower, 'natureza', 'inov'):
+            cols['natureza'] = col
+        if col_lower == 'projeto' or _has_tokens(col_lower, 'projeto', 'inov'):
+            cols['projeto'] = col
+    return cols
+
+
+def _row_facts(df: pd.DataFrame, pos_cols: Dict[str, Optional[str]], inov_cols: Dict[str, Optional[str]]) -> pd.DataFrame:
+    """Projeta cada linha da planilha nos campos usados pelas agregações (ver `lib.incremental`)."""
+    n = len(df)
+    facts = pd.DataFrame(index=df.index)
+
+    def _present(col: Optional[str]) -> pd.Series:
+        # valor original quando preenchido (nao nulo e nao vazio), senao None
+        if not col:
+            return pd.Series([None] * n, index=df.index, dtype=object)
+        s = df[col]
+        mask = s.notna() & (s.astype(str).str.strip() != '')
+        return s.astype(object).where(mask, None)
+
+    col = pos_cols['unidade']
+    facts['unidade_pos'] = df[col].astype(str).astype(object).where(df[col].notna(), None) if col else None
+    col = pos_cols['status']
+    facts['andamento'] = df[col].astype(str).str.contains('andamento', case=False, na=False) if col else False
+    if pos_cols['denominacao'] and pos_cols['alunos']:
+        denom = df[pos_cols['denominacao']]
+        facts['denominacao'] = denom.astype(object).where(denom.notna(), None)
+        facts['alunos'] = parse_int_series(df[pos_cols['alunos']])
+    else:
+        facts['denominacao'] = None
+        facts['alunos'] = 0
+
+    col = inov_cols['projeto']
+    facts['inov'] = df[col].notna() if col else True
+    col = inov_cols['ano']
+    facts['ano'] = df[col].astype(str) if col else 'nan'
+    for dim in ('unidade', 'via', 'cidade', 'natureza'):
+        facts[dim] = _present(inov_cols[dim])
+    return facts
+
+
+def _unidade_options(df: pd.DataFrame, col: Optional[str]) -> List:
+    if not col:
+        return []
+    unidades = df[col].dropna().unique().tolist()
+    unidades = [u for u in unidades if str(u).strip() != '']
+    return ['Todos'] + sorted(unidades)
+
+
+def _ano_options(df: pd.DataFrame, col: Optional[str]) -> List:
+    if not col:
+        return []
+    anos = df[col].dropna().unique().tolist()
+    anos = [a for a in anos if str(a).strip() != '' and str(a).strip() != 'nan']
+    try:
+        anos = sorted([int(a) for a in anos])
+        anos = [str(a) for a in anos]
+    except Exception:
+        anos = sorted(anos)
+    return ['Todos'] + anos
+
+
+class DataView(NamedTuple):
+    """Tudo que os reruns leem de uma versao dos dados, calculado uma unica vez por versao."""
+    df: pd.DataFrame
+    pos_cols: Dict[str, Optional[str]]
+    inov_cols: Dict[str, Optional[str]]
+    facts: pd.DataFrame
+    aggregates: AggregateSnapshot
+    unidades_pos: List
+    anos_inov: List
+
+
+@st.cache_resource
+def _get_aggregates() -> IncrementalAggregates:
+    # Compartilhado entre sessoes: cada refresh aplica so as linhas alteradas
+    return IncrementalAggregates()
+
+
+@st.cache_resource(max_entries=4)
+def _data_view(version: str, _df: pd.DataFrame) -> DataView:
+    # Hash e diff so rodam quando chega uma nova versao dos dados; os reruns de filtro
+    # reutilizam o DataView (e o AggregateSnapshot imutavel) da versao atual
+    pos_cols = _detect_pos_columns(_df)
+    inov_cols = _detect_inov_columns(_df)
+    facts = _row_facts(_df, pos_cols, inov_cols)
+    return DataView(
+        df=_df,
+        pos_cols=pos_cols,
+        inov_cols=inov_cols,
+        facts=facts,
+        aggregates=_get_aggregates().refresh(facts),
+        unidades_pos=_unidade_options(_df, pos_cols['unidade']),
+        anos_inov=_ano_options(_df, inov_cols['ano']),
+    )
+
+
+@st.cache_resource(max_entries=4)
+def _get_search_index(version: str, _df: pd.DataFrame, columns: Tuple[str, ...]) -> SearchIndex:
+    # Construido uma vez por versao dos dados; o DataFrame nao entra na chave do cache
+    return SearchIndex.from_frame(_df, columns)
+
+
+@st.cache_resource(max_entries=64)
+def _search_aggregates(version: str, terms: str, _view: DataView, columns: Tuple[str, ...]) -> Tuple[int, AggregateSnapshot]:
+    # Por versao e consulta normalizada: digitar de novo a mesma busca nao recalcula nada
+    ids = _get_search_index(version, _view.df, columns).search(terms)
+    facts = _view.facts
+    return len(ids), snapshot_from_facts(facts[facts.index.isin(list(ids))])
+
+
+def _new_version(source: str) -> str:
+    return f'{source}:{time.time_ns()}'
+
+
+# Cache curto para acelerar carregamento sem atrasar atualizacoes. Cada carga recebe uma
+# versao nova, que identifica o snapshot nos caches derivados (`_data_view`)
+@st.cache_data(ttl=30)
+def load_sheet_cached(spreadsheet_url: str, creds: Optional[str]) -> Tuple[pd.DataFrame, str]:
+    return fetch_coord_data(spreadsheet_url, creds_path=creds), _new_version('sheet')
+
+
+def _extract_id(s: str) -> str:
+    if s.startswith('http'):
+        try:
+            parts = s.split('/d/')
+            id_part = parts[1].split('/')[0]
+            return id_part
+        except Exception:
+            return s
+    return s
+
+
+def public_sheet_df(spreadsheet_url_or_id: str, sheet_name: str):
+    sid = _extract_id(spreadsheet_url_or_id)
+    sheet_q = quote_plus(sheet_name)
+    url = f'https://docs.google.com/spreadsheets/d/{sid}/gviz/tq?tqx=out:csv&sheet={sheet_q}'
+    resp = requests.get(url, timeout=15)
+    resp.raise_for_status()
+    return pd.read_csv(io.StringIO(resp.text), dtype=str)
+
+
+def _load_public(spreadsheet: str) -> Optional[pd.DataFrame]:
+    # Sem credenciais, tenta leitura publica por nome de aba
+    try:
+        sheets_to_try = ['pós lato sensu', 'inov']
+        dfs_public = []
+        for name in sheets_to_try:
+            try:
+                pdf = public_sheet_df(spreadsheet, name)
+                if not pdf.empty:
+                    dfs_public.append(pdf)
+            except Exception:
+                pass
+
+        if dfs_public:
+            df = pd.concat(dfs_public, ignore_index=True, sort=False)
+            df.columns = [c.strip() for c in df.columns]
+            return df
+    except Exception:
+        pass
+    return None
+
+
+@st.cache_data(ttl=30)
+def load_public_cached(spreadsheet: str) -> Tuple[Optional[pd.DataFrame], str]:
+    return _load_public(spreadsheet), _new_version('public')
+
+
+def _read_csv(path: str) -> pd.DataFrame:
+    df = pd.read_csv(path, sep=';', dtype=str, encoding='utf-8')
+    df.columns = [c.strip() for c in df.columns]
+    return df
+
+
+@st.cache_data
+def load_csv_cached(path: str, mtime_ns: int) -> pd.DataFrame:
+    # `mtime_ns` faz parte da chave: o CSV e relido quando o arquivo muda
+    return _read_csv(path)
+
+
+def _load_dataframe(
+    spreadsheet: str, creds_path: Optional[str], use_cache: bool = True
+) -> Tuple[Optional[pd.DataFrame], Optional[str]]:
+    """Carrega a planilha (service account ou leitura publica) com fallback para o CSV local.
+
+    Retorna (df, versao); a versao so muda quando os dados sao recarregados. Com
+    `use_cache=False` (publicacao do snapshot compartilhado) a versao e None.
+    """
+    df, version = None, None
+    if spreadsheet:
+        if creds_path:
+            try:
+                if use_cache:
+                    df, version = load_sheet_cached(spreadsheet, creds_path)
+                else:
+                    df = fetch_coord_data(spreadsheet, creds_path=creds_path)
+                df.columns = [c.strip() for c in df.columns]
+            except Exception:
+                df, version = None, None
+        elif use_cache:
+            df, version = load_public_cached(spreadsheet)
+        else:
+            df = _load_public(spreadsheet)
+
+    if df is None:
+        dados_csv = Path(os.getenv('DADOS_CSV') or Path(__file__).parent / 'dados_coordenacoes.csv')
+        if dados_csv.exists():
+            try:
+                mtime_ns = dados_csv.stat().st_mtime_ns
+                if use_cache:
+                    df = load_csv_cached(str(dados_csv), mtime_ns)
+                    version = f'csv:{dados_csv}:{mtime_ns}'
+                else:
+                    df = _read_csv(str(dados_csv))
+            except Exception:
+                df, version = None, None
+
+    return df, version
+
+
+def _load_shared_snapshot(
+    snapshot_dir: str, spreadsheet: str, creds_path: Optional[str]
+) -> Tuple[Optional[pd.DataFrame], Optional[str]]:
+    """Usa o snapshot Arrow compartilhado entre processos, republicando-o quando expira.
+
+    Apenas o processo que obtem a trava busca a planilha; os demais continuam anexando a
+    versao atual ate o novo ponteiro ser publicado. Na partida a frio (sem nenhuma versao)
+    quem nao obteve a trava espera a primeira publicacao e, se ela nao vier a tempo, carrega
+    os dados localmente.
+    """
+    acquired = False
+    if snapshot.current_version(snapshot_dir) is None or snapshot.snapshot_age(snapshot_dir) > SNAPSHOT_TTL:
+        with snapshot.publish_lock(snapshot_dir) as acquired:
+            # revalida dentro da trava: outro processo pode ter acabado de publicar
+            if acquired and snapshot.snapshot_age(snapshot_dir) > SNAPSHOT_TTL:
+                fresh, _ = _load_dataframe(spreadsheet, creds_path, use_cache=False)
+                if fresh is not None:
+                    snapshot.publish_snapshot(fresh, snapshot_dir)
+
+    version = snapshot.current_version(snapshot_dir)
+    if version is None and not acquired:
+        version = snapshot.wait_for_version(snapshot_dir, timeout=SNAPSHOT_WAIT)
+    if version is None:
+        return _load_dataframe(spreadsheet, creds_path)
+    return _attached_snapshot(snapshot_dir, version), f'snapshot:{version}'
+
+
+@st.cache_resource(max_entries=2)
+def _attached_snapshot(snapshot_dir: str, version: str) -> pd.DataFrame:
+    # Um DataFrame por versao e por processo, compartilhado (somente leitura) entre as sessoes.
+    # Com pandas >= 3 as colunas de texto continuam apontando para os buffers mapeados; em
+    # versoes anteriores a conversao copia (o snapshot funciona, so nao economiza memoria).
+    return snapshot.attach_snapshot(snapshot_dir, version).to_pandas()
+
+
 def main() -> None:
     st.set_page_config(page_title="Dashboard Coordenações UPE", layout="wide")
 
@@ -114,67 +413,14 @@ def main() -> None:
 
     st.title("Dashboard PROPEGI")
 
-    df = None
     spreadsheet = os.getenv('SPREADSHEET_URL') or os.getenv('SPREADSHEET_ID') or DEFAULT_SPREADSHEET
     creds_path = os.getenv('GOOGLE_SERVICE_ACCOUNT_FILE')
+    snapshot_dir = os.getenv('SNAPSHOT_DIR')
 
-    # Cache curto para acelerar carregamento sem atrasar atualizacoes
-    @st.cache_data(ttl=30)
-    def load_sheet_cached(spreadsheet_url: str, creds: Optional[str]):
-        return fetch_coord_data(spreadsheet_url, creds_path=creds)
-
-    if spreadsheet:
-        if creds_path:
-            try:
-                df = load_sheet_cached(spreadsheet, creds_path)
-                df.columns = [c.strip() for c in df.columns]
-            except Exception:
-                pass
-        else:
-            # Sem credenciais, tenta leitura publica por nome de aba
-            def _extract_id(s: str) -> str:
-                if s.startswith('http'):
-                    try:
-                        parts = s.split('/d/')
-                        id_part = parts[1].split('/')[0]
-                        return id_part
-                    except Exception:
-                        return s
-                return s
-
-            def public_sheet_df(spreadsheet_url_or_id: str, sheet_name: str):
-                sid = _extract_id(spreadsheet_url_or_id)
-                sheet_q = quote_plus(sheet_name)
-                url = f'https://docs.google.com/spreadsheets/d/{sid}/gviz/tq?tqx=out:csv&sheet={sheet_q}'
-                resp = requests.get(url, timeout=15)
-                resp.raise_for_status()
-                return pd.read_csv(io.StringIO(resp.text), dtype=str)
-
-            try:
-                sheets_to_try = ['pós lato sensu', 'inov']
-                dfs_public = []
-                for name in sheets_to_try:
-                    try:
-                        pdf = public_sheet_df(spreadsheet, name)
-                        if not pdf.empty:
-                            dfs_public.append(pdf)
-                    except Exception:
-                        pass
-
-                if dfs_public:
-                    df = pd.concat(dfs_public, ignore_index=True, sort=False)
-                    df.columns = [c.strip() for c in df.columns]
-            except Exception:
-                pass
-
-    if df is None:
-        dados_csv = Path(__file__).parent / 'dados_coordenacoes.csv'
-        if dados_csv.exists():
-            try:
-                df = pd.read_csv(dados_csv, sep=';', dtype=str, encoding='utf-8')
-                df.columns = [c.strip() for c in df.columns]
-            except Exception:
-                pass
+    if snapshot_dir:
+        df, data_version = _load_shared_snapshot(snapshot_dir, spreadsheet, creds_path)
+    else:
+        df, data_version = _load_dataframe(spreadsheet, creds_path)
 
     if df is None:
         st.error('Nao foi possivel carregar dados da planilha online nem do CSV local.')
@@ -185,245 +431,162 @@ def main() -> None:
         st.stop()
 
     if df is not None:
+        view = _data_view(data_version, df)
+        df, pos_cols, inov_cols = view.df, view.pos_cols, view.inov_cols
+        aggregates = view.aggregates
+
+        search_cols = tuple(
+            c for c in (pos_cols['denominacao'], inov_cols['projeto'], inov_cols['unidade'], inov_cols['cidade']) if c
+        )
+        with st.sidebar:
+            st.markdown("### Busca")
+            query = st.text_input('Curso, projeto, unidade ou cidade', key='busca')
+            terms = ' '.join(tokenize(query))
+            if terms and search_cols:
+                found, aggregates = _search_aggregates(data_version, terms, view, search_cols)
+                st.caption(f'{found} linha(s) encontrada(s)')
+                # Os gráficos passam a refletir só as linhas encontradas
+
         tab_pos, tab_inov = st.tabs(["Pós Lato-Sensu", "Inovação"])
 
         with tab_pos:
             st.markdown("## Coordenação de Pós Lato-Sensu")
 
-            col_unidade_pos = None
-            col_denom_pos = None
-            col_status_pos = None
-            col_alunos_pos = None
-            col_remuneracao_pos = None
-
-            for col in df.columns:
-                col_lower = _normalize_col(col)
-                if 'unidade_pos' in col_lower or _has_tokens(col_lower, 'unidade', 'pos'):
-                    col_unidade_pos = col
-                if 'denominacao_pos' in col_lower or _has_tokens(col_lower, 'denominacao', 'pos'):
-                    col_denom_pos = col
-                if _has_tokens(col_lower, 'status', 'curso', 'pos') or _has_tokens(col_lower, 'status', 'pos'):
-                    col_status_pos = col
-                if _has_tokens(col_lower, 'alunos', 'matriculados', 'pos') or _has_tokens(col_lower, 'alunos', 'pos'):
-                    col_alunos_pos = col
-                if _has_tokens(col_lower, 'remuneracao', 'pos') or _has_tokens(col_lower, 'total', 'remuner', 'pos'):
-                    col_remuneracao_pos = col
+            col_unidade_pos = pos_cols['unidade']
+            col_denom_pos = pos_cols['denominacao']
+            col_status_pos = pos_cols['status']
+            col_alunos_pos = pos_cols['alunos']
+
+            budget_pos = PayloadBudget('Pós Lato-Sensu', POS_PAYLOAD_BUDGET)
 
             with st.sidebar:
                 st.markdown("### Filtro - Pós Lato-Sensu")
                 unidade_pos_sel = None
                 if col_unidade_pos:
-                    unidades = df[col_unidade_pos].dropna().unique().tolist()
-                    unidades = [u for u in unidades if str(u).strip() != '']
-                    unidades = ['Todos'] + sorted(unidades)
-                    unidade_pos_sel = st.selectbox('UNIDADE (Pós)', unidades, key='unidade_pos')
+                    unidade_pos_sel = st.selectbox('UNIDADE (Pós)', view.unidades_pos, key='unidade_pos')
 
-            df_pos = df.copy()
+            unidade_key = ALL
             if unidade_pos_sel and unidade_pos_sel != 'Todos' and col_unidade_pos:
-                df_pos = df_pos[df_pos[col_unidade_pos].astype(str) == unidade_pos_sel]
+                unidade_key = str(unidade_pos_sel)
 
             if col_status_pos:
-                df_andamento = df_pos[
-                    df_pos[col_status_pos].astype(str).str.contains('andamento', case=False, na=False)
-                ]
-                count_andamento = len(df_andamento)
+                count_andamento = aggregates.count_andamento(unidade_key)
                 st.metric('Cursos em Andamento', count_andamento)
 
             if col_denom_pos and col_alunos_pos:
-                df_top = df_pos[[col_denom_pos, col_alunos_pos]].copy()
-                df_top.columns = ['Denominacao', 'Alunos']
-                df_top = df_top[df_top['Denominacao'].notna()]
-                df_top = df_top[df_top['Alunos'].notna()]
-                df_top['Alunos'] = parse_int_series(df_top['Alunos'])
-                df_top = df_top[df_top['Alunos'] > 0]
-                df_top = df_top.sort_values('Alunos', ascending=False).head(10)
+                df_top = aggregates.top_alunos(unidade_key, 10)
 
                 if not df_top.empty:
                     st.markdown("### Top 10 Denominações com Mais Alunos Matriculados")
-                    fig2 = px.bar(
+                    fig2 = bar_figure(
                         df_top,
                         x='Alunos',
                         y='Denominacao',
                         orientation='h',
-                        title='',
                         labels={'Alunos': 'Quantidade de Alunos', 'Denominacao': ''},
-                        color='Alunos',
-                        color_continuous_scale=['#08306b', '#08519c', '#2171b5', '#4292c6'],
-                    )
-                    fig2.update_layout(
-                        yaxis={'categoryorder': 'total ascending'},
-                        showlegend=False,
                         height=400,
-                        margin=dict(l=0, r=0, t=0, b=0),
+                        category_ascending=True,
                     )
-                    fig2.update_traces(marker=dict(line=dict(color='#0b3d91', width=1)))
-                    st.plotly_chart(fig2, use_container_width=True)
+                    plot(fig2, budget_pos)
                 else:
                     st.info("Sem dados de alunos para exibir.")
 
         with tab_inov:
             st.markdown("## Coordenação de Inovação")
 
-            col_ano_inov = None
-            col_unidade_inov = None
-            col_via_inov = None
-            col_cidade_inov = None
-            col_natureza_inov = None
-            col_projeto_inov = None
-
-            for col in df.columns:
-                col_lower = _normalize_col(col)
-                if col_lower == 'ano_inov' or _has_tokens(col_lower, 'ano', 'inov'):
-                    col_ano_inov = col
-                if col_lower == 'unidade' or _has_tokens(col_lower, 'unidade', 'inov'):
-                    col_unidade_inov = col
-                if col_lower == 'via_inov' or _has_tokens(col_lower, 'via', 'inov'):
-                    col_via_inov = col
-                if col_lower == 'cidade' or _has_tokens(col_lower, 'cidade', 'inov'):
-                    col_cidade_inov = col
-                if col_lower == 'natureza_inov' or _has_tokens(col_lower, 'natureza', 'inov'):
-                    col_natureza_inov = col
-                if col_lower == 'projeto' or _has_tokens(col_lower, 'projeto', 'inov'):
-                    col_projeto_inov = col
+            col_ano_inov = inov_cols['ano']
+            col_unidade_inov = inov_cols['unidade']
+            col_via_inov = inov_cols['via']
+            col_cidade_inov = inov_cols['cidade']
+            col_natureza_inov = inov_cols['natureza']
+
+            budget_inov = PayloadBudget('Inovação', INOV_PAYLOAD_BUDGET)
 
             with st.sidebar:
                 st.markdown("### Filtro - Inovação")
                 ano_inov_sel = None
                 if col_ano_inov:
-                    anos = df[col_ano_inov].dropna().unique().tolist()
-                    anos = [a for a in anos if str(a).strip() != '' and str(a).strip() != 'nan']
-                    try:
-                        anos = sorted([int(a) for a in anos])
-                        anos = [str(a) for a in anos]
-                    except Exception:
-                        anos = sorted(anos)
-                    anos = ['Todos'] + anos
-                    ano_inov_sel = st.selectbox('Ano de Criação (Inovação)', anos, key='ano_inov')
-
-            df_inov = df.copy()
-            df_inov = df_inov[df_inov[col_projeto_inov].notna()] if col_projeto_inov else df_inov
+                    ano_inov_sel = st.selectbox('Ano de Criação (Inovação)', view.anos_inov, key='ano_inov')
 
+            ano_key = ALL
             if ano_inov_sel and ano_inov_sel != 'Todos' and col_ano_inov:
-                df_inov = df_inov[df_inov[col_ano_inov].astype(str) == str(ano_inov_sel)]
+                ano_key = str(ano_inov_sel)
 
             kpi_via_col1, kpi_via_col2 = st.columns([1, 1.5])
 
             if col_unidade_inov:
-                df_per_unit = df_inov[df_inov[col_unidade_inov].notna()].copy()
-                df_per_unit = df_per_unit[df_per_unit[col_unidade_inov].astype(str).str.strip() != '']
-                count_per_unit = df_per_unit.groupby(col_unidade_inov).size().reset_index(name='Quantidade')
+                count_per_unit = aggregates.counts('unidade', ano_key).rename(columns={'unidade': col_unidade_inov})
                 total_projetos = count_per_unit['Quantidade'].sum()
 
                 with kpi_via_col1:
                     st.metric('Total de Projetos', total_projetos)
 
             if col_via_inov:
-                df_per_via = df_inov[df_inov[col_via_inov].notna()].copy()
-                df_per_via = df_per_via[df_per_via[col_via_inov].astype(str).str.strip() != '']
-                count_per_via = df_per_via.groupby(col_via_inov).size().reset_index(name='Quantidade')
+                count_per_via = aggregates.counts('via', ano_key).rename(columns={'via': col_via_inov})
                 count_per_via = count_per_via.sort_values('Quantidade', ascending=False)
 
                 with kpi_via_col2:
                     if not count_per_via.empty:
                         st.markdown("### Projetos por Via")
-                        fig4 = px.bar(
+                        fig4 = bar_figure(
                             count_per_via,
                             x=col_via_inov,
                             y='Quantidade',
-                            title='',
                             labels={'Quantidade': 'Quantidade de Projetos', col_via_inov: 'Via'},
-                            color='Quantidade',
-                            color_continuous_scale=['#08306b', '#08519c', '#2171b5', '#4292c6'],
-                        )
-                        fig4.update_layout(
-                            showlegend=False,
                             height=300,
-                            margin=dict(l=0, r=0, t=0, b=0),
                         )
-                        fig4.update_traces(marker=dict(line=dict(color='#0b3d91', width=1)))
-                        st.plotly_chart(fig4, use_container_width=True)
+                        plot(fig4, budget_inov)
 
             st.markdown("### Distribuição de Projetos por Unidade")
             if col_unidade_inov:
-                df_per_unit = df_inov[df_inov[col_unidade_inov].notna()].copy()
-                df_per_unit = df_per_unit[df_per_unit[col_unidade_inov].astype(str).str.strip() != '']
-                count_per_unit = df_per_unit.groupby(col_unidade_inov).size().reset_index(name='Quantidade')
                 count_per_unit = count_per_unit.sort_values('Quantidade', ascending=True)
 
                 if not count_per_unit.empty:
-                    fig3 = px.bar(
+                    fig3 = bar_figure(
                         count_per_unit,
                         x='Quantidade',
                         y=col_unidade_inov,
                         orientation='h',
-                        title='',
                         labels={'Quantidade': 'Quantidade de Projetos', col_unidade_inov: 'Unidade'},
-                        color='Quantidade',
-                        color_continuous_scale=['#08306b', '#08519c', '#2171b5', '#4292c6'],
-                    )
-                    fig3.update_layout(
-                        showlegend=False,
                         height=350,
-                        margin=dict(l=0, r=0, t=0, b=0),
                     )
-                    fig3.update_traces(marker=dict(line=dict(color='#0b3d91', width=1)))
-                    st.plotly_chart(fig3, use_container_width=True)
+                    plot(fig3, budget_inov)
 
-            cidade_nat_col1, cidade_nat_col2 = st.columns(2)
+            # Cidades e natureza ficam lado a lado: uma única figura de subplots
+            panels = []
 
             if col_cidade_inov:
-                df_per_city = df_inov[df_inov[col_cidade_inov].notna()].copy()
-                df_per_city = df_per_city[df_per_city[col_cidade_inov].astype(str).str.strip() != '']
-                count_per_city = df_per_city.groupby(col_cidade_inov).size().reset_index(name='Quantidade')
+                count_per_city = aggregates.counts('cidade', ano_key).rename(columns={'cidade': col_cidade_inov})
                 count_per_city = count_per_city.sort_values('Quantidade', ascending=False).head(15)
 
-                with cidade_nat_col1:
-                    if not count_per_city.empty:
-                        st.markdown("### Top 15 Cidades com Mais Projetos")
-                        fig5 = px.bar(
-                            count_per_city,
-                            x='Quantidade',
-                            y=col_cidade_inov,
-                            orientation='h',
-                            title='',
-                            labels={'Quantidade': 'Quantidade de Projetos', col_cidade_inov: 'Cidade'},
-                            color='Quantidade',
-                            color_continuous_scale=['#08306b', '#08519c', '#2171b5', '#4292c6'],
-                        )
-                        fig5.update_layout(
-                            yaxis={'categoryorder': 'total ascending'},
-                            showlegend=False,
-                            height=400,
-                            margin=dict(l=0, r=0, t=0, b=0),
-                        )
-                        fig5.update_traces(marker=dict(line=dict(color='#0b3d91', width=1)))
-                        st.plotly_chart(fig5, use_container_width=True)
+                if not count_per_city.empty:
+                    panels.append(dict(
+                        title='Top 15 Cidades com Mais Projetos',
+                        data=count_per_city,
+                        x='Quantidade',
+                        y=col_cidade_inov,
+                        orientation='h',
+                        labels={'Quantidade': 'Quantidade de Projetos', col_cidade_inov: 'Cidade'},
+                        category_ascending=True,
+                    ))
 
             if col_natureza_inov:
-                df_per_nat = df_inov[df_inov[col_natureza_inov].notna()].copy()
-                df_per_nat = df_per_nat[df_per_nat[col_natureza_inov].astype(str).str.strip() != '']
-                count_per_nat = df_per_nat.groupby(col_natureza_inov).size().reset_index(name='Quantidade')
+                count_per_nat = aggregates.counts('natureza', ano_key).rename(columns={'natureza': col_natureza_inov})
                 count_per_nat = count_per_nat.sort_values('Quantidade', ascending=False)
 
-                with cidade_nat_col2:
-                    if not count_per_nat.empty:
-                        st.markdown("### Projetos por Natureza")
-                        fig6 = px.bar(
-                            count_per_nat,
-                            x=col_natureza_inov,
-                            y='Quantidade',
-                            title='',
-                            labels={'Quantidade': 'Quantidade de Projetos', col_natureza_inov: 'Natureza'},
-                            color='Quantidade',
-                            color_continuous_scale=['#08306b', '#08519c', '#2171b5', '#4292c6'],
-                        )
-                        fig6.update_layout(
-                            showlegend=False,
-                            height=400,
-                            margin=dict(l=0, r=0, t=0, b=0),
-                        )
-                        fig6.update_traces(marker=dict(line=dict(color='#0b3d91', width=1)))
-                        st.plotly_chart(fig6, use_container_width=True)
+                if not count_per_nat.empty:
+                    panels.append(dict(
+                        title='Projetos por Natureza',
+                        data=count_per_nat,
+                        x=col_natureza_inov,
+                        y='Quantidade',
+                        labels={'Quantidade': 'Quantidade de Projetos', col_natureza_inov: 'Natureza'},
+                    ))
+
+            if panels:
+                st.markdown("### Cidades e Natureza dos Projetos")
+                fig5 = bar_grid(panels, cols=len(panels), height=400)
+                plot(fig5, budget_inov)
 
 
 if __name__ == "__main__":
@@ -4,25 +4,69 @@ import plotly.express as px
 import streamlit as st
 import pandas as pd
 
+from plotly.subplots import make_subplots
 
-def render_performance_monthly(monthly: List[Dict], coordination_names: List[str], colors: List[str]) -> None:
+from components.figures import PayloadBudget, plot
+from lib.downsample import lttb_indices
+
+# Orçamento de payload (bytes de JSON Plotly) para todos os gráficos de `render_all`
+RENDER_ALL_PAYLOAD_BUDGET = 400_000
+
+
+def render_performance_monthly(
+    monthly: List[Dict],
+    coordination_names: List[str],
+    colors: List[str],
+    max_points: int = 8000,
+    webgl_threshold: int = 2000,
+    key: str = "performance_mensal",
+    budget: PayloadBudget | None = None,
+) -> None:
     if not monthly:
         st.info("Sem dados mensais")
         return
 
     df = pd.DataFrame(monthly)
+    columns = [(i, name, f"coord{i+1}") for i, name in enumerate(coordination_names) if f"coord{i+1}" in df]
+
+    # `max_points` é o orçamento total de pontos da figura, dividido entre as séries
+    per_series = max(3, max_points // max(len(columns), 1))
+
+    # Séries longas: o seletor de período funciona como zoom; ao estreitar a janela
+    # a série volta a ser desenhada em resolução completa
+    if len(df) > per_series:
+        labels = df["month"].astype(str).tolist()
+        start, end = st.select_slider(
+            "Período",
+            options=list(range(len(df))),
+            value=(0, len(df) - 1),
+            format_func=lambda i: labels[i],
+            key=key,
+        )
+        df = df.iloc[start:end + 1]
+
+    # Cada série é reduzida pelo LTTB com seus próprios pontos de x; a ordem dos meses no
+    # eixo de categorias é fixada uma única vez em `categoryarray`
+    series = []
+    for i, name, col in columns:
+        idx = lttb_indices(df[col].to_numpy(dtype=float), per_series)
+        series.append((i, name, df["month"].iloc[idx], df[col].iloc[idx]))
+
+    # Acima do limite de pontos usa WebGL (Scattergl) para não travar o navegador
+    total_points = sum(len(y) for _, _, _, y in series)
+    scatter = go.Scattergl if total_points > webgl_threshold else go.Scatter
+
     fig = go.Figure()
-    for i, name in enumerate(coordination_names):
-        key = f"coord{i+1}"
-        if key in df:
-            fig.add_trace(go.Scatter(x=df["month"], y=df[key], mode="lines", name=name,
-                                     line=dict(color=colors[i % len(colors)]), fill='tozeroy'))
+    for i, name, x, y in series:
+        fig.add_trace(scatter(x=x, y=y, mode="lines", name=name,
+                              line=dict(color=colors[i % len(colors)]), fill='tozeroy'))
 
     fig.update_layout(margin=dict(t=30, b=20, l=0, r=0), legend=dict(orientation="h"))
-    st.plotly_chart(fig, use_container_width=True)
+    fig.update_xaxes(type="category", categoryorder="array", categoryarray=df["month"].tolist())
+    plot(fig, budget)
 
 
-def render_budget_pie(coordinations: List[Dict], colors: List[str]) -> None:
+def render_budget_pie(coordinations: List[Dict], colors: List[str], budget: PayloadBudget | None = None) -> None:
     # Use bar chart instead of pie to show budget distribution
     if not coordinations:
         st.info("Sem dados de coordenações")
@@ -32,10 +76,10 @@ def render_budget_pie(coordinations: List[Dict], colors: List[str]) -> None:
     df = pd.DataFrame({"coord": labels, "budget": values})
     fig = px.bar(df, x="coord", y="budget", color="coord", color_discrete_sequence=colors, title="Distribuição de Orçamento (barra)")
     fig.update_layout(showlegend=False)
-    st.plotly_chart(fig, use_container_width=True)
+    plot(fig, budget)
 
 
-def render_projects_by_coordination(coordinations: List[Dict], colors: List[str]) -> None:
+def render_projects_by_coordination(coordinations: List[Dict], colors: List[str], budget: PayloadBudget | None = None) -> None:
     names = [c["name"].replace("Coordenação ", "Coord. ") for c in coordinations]
     concluido = [c.get("completed", 0) for c in coordinations]
     andamento = [c.get("inProgress", 0) for c in coordinations]
@@ -45,15 +89,29 @@ def render_projects_by_coordination(coordinations: List[Dict], colors: List[str]
         go.Bar(name='Em Andamento', x=df['name'], y=df['Em Andamento'], marker_color='rgb(245,158,11)')
     ])
     fig.update_layout(barmode='group', margin=dict(t=30, b=20))
-    st.plotly_chart(fig, use_container_width=True)
+    plot(fig, budget)
 
 
-def render_team_size(coordinations: List[Dict], colors: List[str]) -> None:
+def render_team_size(coordinations: List[Dict], colors: List[str], budget: PayloadBudget | None = None) -> None:
     names = [c["name"].replace("Coordenação ", "Coord. ") for c in coordinations]
     team = [c.get("team", 0) for c in coordinations]
     fig = go.Figure(go.Bar(x=team, y=names, orientation='h', marker_color=colors))
     fig.update_layout(margin=dict(t=30, b=20))
-    st.plotly_chart(fig, use_container_width=True)
+    plot(fig, budget)
+
+
+def render_projects_and_team(coordinations: List[Dict], colors: List[str], budget: PayloadBudget | None = None) -> None:
+    # Projetos por coordenação e tamanho da equipe em uma única figura (layout enviado uma vez)
+    names = [c["name"].replace("Coordenação ", "Coord. ") for c in coordinations]
+    fig = make_subplots(rows=1, cols=2, subplot_titles=["Projetos por Coordenação", "Tamanho da Equipe"])
+    fig.add_trace(go.Bar(name='Concluídos', x=names, y=[c.get("completed", 0) for c in coordinations],
+                         marker_color='rgb(22,163,74)'), row=1, col=1)
+    fig.add_trace(go.Bar(name='Em Andamento', x=names, y=[c.get("inProgress", 0) for c in coordinations],
+                         marker_color='rgb(245,158,11)'), row=1, col=1)
+    fig.add_trace(go.Bar(name='Equipe', x=[c.get("team", 0) for c in coordinations], y=names, orientation='h',
+                         marker_color=colors, showlegend=False), row=1, col=2)
+    fig.update_layout(barmode='group', margin=dict(t=30, b=20), legend=dict(orientation="h"))
+    plot(fig, budget)
 
 
 def render_all(data: Dict, coordination_names: List[str] | None = None, colors: List[str] | None = None) -> None:
@@ -64,17 +122,16 @@ def render_all(data: Dict, coordination_names: List[str] | None = None, colors:
         # fallback palette
         colors = px.colors.qualitative.Plotly
 
+    budget = PayloadBudget('render_all', RENDER_ALL_PAYLOAD_BUDGET)
+
     col1, col2 = st.columns(2)
     with col1:
         st.subheader('Performance Mensal')
-        render_performance_monthly(data.get('monthly', []), coordination_names, colors)
+        render_performance_monthly(data.get('monthly', []), coordination_names, colors, budget=budget)
 
     with col2:
         st.subheader('Distribuição de Orçamento')
-        render_budget_pie(coords, colors)
-
-    st.subheader('Projetos por Coordenação')
-    render_projects_by_coordination(coords, colors)
+        render_budget_pie(coords, colors, budget=budget)
 
-    st.subheader('Tamanho da Equipe')
-    render_team_size(coords, colors)
+    st.subheader('Projetos e Equipe por Coordenação')
+    render_projects_and_team(coords, colors, budget=budget)
@@ -1,5 +1,11 @@
+import html
+from typing import Dict, List
+
 import streamlit as st
 
+from components.markup import content_keys, css_color
+from components.pagination import paginate
+
 
 def render_coordination_card(data: dict, index: int = 0, color: str | None = None) -> None:
     name = data.get("name", "Coordenação")
@@ -13,14 +19,16 @@ def render_coordination_card(data: dict, index: int = 0, color: str | None = Non
 
     budget_usage = int((spent / budget) * 100) if budget else 0
 
+    color = css_color(color, '#ddd')
+
     card = st.container()
     with card:
         html = (
             f"<div style='border-radius:12px;border:1px solid #e6e6e6;padding:14px;background:#fff;'>"
-            f"<div style='height:6px;background:{color or '#ddd'};border-radius:6px;margin:-14px -14px 8px -14px;'></div>"
+            f"<div style='height:6px;background:{color};border-radius:6px;margin:-14px -14px 8px -14px;'></div>"
             f"<div style='display:flex;justify-content:space-between;align-items:center;'>"
             f"<strong>{name}</strong>"
-            f"<span style='background:{color or '#ddd'};color:#fff;padding:4px 8px;border-radius:999px;font-size:12px;'>{satisfaction}% satisfação</span>"
+            f"<span style='background:{color};color:#fff;padding:4px 8px;border-radius:999px;font-size:12px;'>{satisfaction}% satisfação</span>"
             "</div>"
             "</div>"
         )
@@ -36,3 +44,67 @@ def render_coordination_card(data: dict, index: int = 0, color: str | None = Non
         prog_val = (budget_usage / 100) if budget else 0
         st.progress(prog_val)
         st.caption(f"R$ {spent:,} gasto • R$ {budget:,} total")
+
+
+def _card_keys(coordinations: List[Dict]) -> List[str]:
+    # calculadas sobre a lista completa (não só a página): `id` explícito ou slug do nome
+    return content_keys(
+        "coord", [c.get("name", "") for c in coordinations], [c.get("id") for c in coordinations]
+    )
+
+
+def _card_html(data: dict, key: str, color: str | None = None) -> str:
+    name = html.escape(str(data.get("name", "Coordenação")))
+    completed = data.get("completed", 0)
+    in_progress = data.get("inProgress", 0)
+    team = data.get("team", 0)
+    projects = data.get("projects", completed + in_progress)
+    satisfaction = data.get("satisfaction", 0)
+    spent = data.get("spent", 0)
+    budget = data.get("budget", 0)
+    budget_usage = min(int((spent / budget) * 100), 100) if budget else 0
+    color = css_color(color, '#ddd')
+
+    stats = "".join(
+        f"<div><strong>{v}</strong><br><span style='font-size:12px;color:#666'>{label}</span></div>"
+        for v, label in [(completed, "Concluídos"), (in_progress, "Em andamento"), (team, "Equipe"), (projects, "Total projetos")]
+    )
+    return (
+        f"<div data-key='{key}' style='border-radius:12px;border:1px solid #e6e6e6;padding:14px;background:#fff;'>"
+        f"<div style='height:6px;background:{color};border-radius:6px;margin:-14px -14px 8px -14px;'></div>"
+        f"<div style='display:flex;justify-content:space-between;align-items:center;'>"
+        f"<strong>{name}</strong>"
+        f"<span style='background:{color};color:#fff;padding:4px 8px;border-radius:999px;font-size:12px;'>{satisfaction}% satisfação</span>"
+        "</div>"
+        f"<div style='display:grid;grid-template-columns:repeat(4,1fr);gap:8px;margin:12px 0;'>{stats}</div>"
+        f"<div style='height:8px;background:#eee;border-radius:4px;'><div style='width:{budget_usage}%;height:8px;background:{color};border-radius:4px;'></div></div>"
+        f"<div style='font-size:12px;color:#666;margin-top:4px;'>R$ {spent:,} gasto • R$ {budget:,} total</div>"
+        "</div>"
+    )
+
+
+def render_coordination_grid(
+    coordinations: List[Dict],
+    colors: List[str] | None = None,
+    columns: int = 3,
+    page_size: int = 24,
+    key: str = "coord_grid",
+) -> None:
+    """Renderiza todos os cards da página atual em um único bloco HTML.
+
+    Diferente de `render_coordination_card` (cerca de oito elementos por coordenação), o custo
+    por rerun fica constante: um elemento para o grid e, se necessário, um seletor de página.
+    """
+    if not coordinations:
+        st.info("Sem dados de coordenações")
+        return
+    colors = colors or []
+    items = list(enumerate(zip(coordinations, _card_keys(coordinations))))
+    cards = "".join(
+        _card_html(data, card_key, colors[i % len(colors)] if colors else None)
+        for i, (data, card_key) in paginate(items, page_size, key=f"{key}_page")
+    )
+    st.markdown(
+        f"<div id='{key}' style='display:grid;grid-template-columns:repeat({columns},minmax(0,1fr));gap:16px;'>{cards}</div>",
+        unsafe_allow_html=True,
+    )
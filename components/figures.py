@@ -0,0 +1,174 @@
+import logging
+import os
+from typing import Dict, List, Optional
+
+import pandas as pd
+import plotly.graph_objects as go
+import plotly.io as pio
+import streamlit as st
+from plotly.subplots import make_subplots
+
+logger = logging.getLogger(__name__)
+
+COLOR_SCALE = ['#08306b', '#08519c', '#2171b5', '#4292c6']
+BAR_LINE = dict(color='#0b3d91', width=1)
+# Painéis de `bar_grid` com escala de cores própria (coloraxis, coloraxis2, ...)
+MAX_PANELS = 4
+
+# Medir o payload serializa cada figura mais uma vez; só é feito com CHECK_PAYLOAD=1 (avisa
+# no log), CHECK_PAYLOAD=strict (o excesso levanta erro) ou em orçamentos `strict`
+CHECK_PAYLOAD = os.getenv('CHECK_PAYLOAD', '') not in ('', '0')
+STRICT_PAYLOAD = os.getenv('CHECK_PAYLOAD', '') == 'strict'
+
+
+def _coloraxis(i: int) -> str:
+    return 'coloraxis' if i == 0 else f'coloraxis{i + 1}'
+
+
+def _build_template() -> go.layout.Template:
+    # Parte do template padrão (o do Streamlit, quando carregado) só o que os gráficos do
+    # dashboard usam: a paleta discreta e uma coloraxis com a escala azul. Estilos repetidos
+    # (escala de cores, contorno das barras) vão no template e não em cada trace.
+    base = pio.templates[pio.templates.default] if pio.templates.default else go.layout.Template()
+    layout = {_coloraxis(i): {'colorscale': COLOR_SCALE} for i in range(MAX_PANELS)}
+    if base.layout.colorway:
+        layout['colorway'] = base.layout.colorway
+    return go.layout.Template(layout=layout, data={'bar': [go.Bar(marker=dict(line=BAR_LINE))]})
+
+
+DASHBOARD_TEMPLATE = _build_template()
+
+
+def bar_trace(
+    data: pd.DataFrame,
+    x: str,
+    y: str,
+    orientation: str = 'v',
+    labels: Optional[Dict[str, str]] = None,
+    coloraxis: str = 'coloraxis',
+) -> go.Bar:
+    """Barra colorida pela quantidade usando uma coloraxis definida no template."""
+    labels = labels or {}
+    value_col = x if orientation == 'h' else y
+    return go.Bar(
+        x=data[x],
+        y=data[y],
+        orientation=orientation,
+        marker=dict(color=data[value_col], coloraxis=coloraxis),
+        hovertemplate=f"{labels.get(x, x)}=%{{x}}<br>{labels.get(y, y)}=%{{y}}<extra></extra>",
+        showlegend=False,
+    )
+
+
+def bar_figure(
+    data: pd.DataFrame,
+    x: str,
+    y: str,
+    orientation: str = 'v',
+    labels: Optional[Dict[str, str]] = None,
+    height: int = 400,
+    category_ascending: bool = False,
+) -> go.Figure:
+    labels = labels or {}
+    value_col = x if orientation == 'h' else y
+    fig = go.Figure(bar_trace(data, x, y, orientation, labels))
+    fig.update_layout(
+        template=DASHBOARD_TEMPLATE,
+        xaxis_title=labels.get(x, x),
+        yaxis_title=labels.get(y, y),
+        coloraxis_colorbar_title=labels.get(value_col, value_col),
+        showlegend=False,
+        height=height,
+        margin=dict(l=0, r=0, t=0, b=0),
+    )
+    if category_ascending:
+        fig.update_yaxes(categoryorder='total ascending')
+    return fig
+
+
+def bar_grid(panels: List[Dict], cols: int = 2, height: int = 400, titles: bool = True) -> go.Figure:
+    """Monta vários gráficos de barras em uma única figura de subplots.
+
+    Cada painel é um dict com as chaves aceitas por `bar_figure` (data, x, y, orientation,
+    labels, category_ascending) e, opcionalmente, `title`. Layout e template são enviados
+    uma única vez; cada painel tem sua própria coloraxis (mesma escala, faixa independente).
+    """
+    if len(panels) > MAX_PANELS:
+        raise ValueError(f"bar_grid suporta no máximo {MAX_PANELS} painéis")
+    rows = (len(panels) + cols - 1) // cols
+    fig = make_subplots(
+        rows=rows,
+        cols=cols,
+        subplot_titles=[p.get('title', '') for p in panels] if titles else None,
+        horizontal_spacing=0.15,
+    )
+    for i, panel in enumerate(panels):
+        row, col = i // cols + 1, i % cols + 1
+        labels = panel.get('labels') or {}
+        x, y = panel['x'], panel['y']
+        orientation = panel.get('orientation', 'v')
+        value_col = x if orientation == 'h' else y
+        fig.add_trace(
+            bar_trace(panel['data'], x, y, orientation, labels, coloraxis=_coloraxis(i)), row=row, col=col
+        )
+        # barra de cores ao lado do próprio painel
+        subplot = fig.get_subplot(row, col)
+        y0, y1 = subplot.yaxis.domain
+        fig.update_layout({_coloraxis(i): dict(colorbar=dict(
+            title=labels.get(value_col, value_col), x=subplot.xaxis.domain[1] + 0.01,
+            y=(y0 + y1) / 2, len=y1 - y0, thickness=12,
+        ))})
+        fig.update_xaxes(title_text=labels.get(x, x), row=row, col=col)
+        fig.update_yaxes(title_text=labels.get(y, y), row=row, col=col)
+        if panel.get('category_ascending'):
+            fig.update_yaxes(categoryorder='total ascending', row=row, col=col)
+    fig.update_layout(
+        template=DASHBOARD_TEMPLATE,
+        showlegend=False,
+        height=height * rows,
+        margin=dict(l=0, r=0, t=30 if titles else 0, b=0),
+    )
+    return fig
+
+
+def payload_size(fig: go.Figure) -> int:
+    """Tamanho em bytes do JSON que o Streamlit envia ao navegador para a figura."""
+    return len(pio.to_json(fig, validate=False).encode('utf-8'))
+
+
+class PayloadBudget:
+    """Acumula o tamanho das figuras de uma view e avisa quando o orçamento é excedido.
+
+    Só mede com `CHECK_PAYLOAD` ligado ou `strict=True`; no modo estrito o excesso levanta
+    `RuntimeError` (útil em testes de carga/CI). Sem `strict`, vale `CHECK_PAYLOAD=strict`.
+    """
+
+    def __init__(self, view: str, limit_bytes: int, strict: Optional[bool] = None):
+        self.view = view
+        self.limit_bytes = limit_bytes
+        self.strict = STRICT_PAYLOAD if strict is None else strict
+        self.total = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.strict or CHECK_PAYLOAD
+
+    def add(self, fig: go.Figure) -> int:
+        if not self.enabled:
+            return 0
+        size = payload_size(fig)
+        self.total += size
+        if self.total > self.limit_bytes:
+            msg = f"View '{self.view}' excedeu o orçamento de payload: {self.total} > {self.limit_bytes} bytes"
+            if self.strict:
+                raise RuntimeError(msg)
+            logger.warning(msg)
+        return size
+
+
+def plot(fig: go.Figure, budget: Optional[PayloadBudget] = None) -> None:
+    """Aplica o template compacto, contabiliza o payload e renderiza a figura."""
+    fig.update_layout(template=DASHBOARD_TEMPLATE)
+    if budget is not None:
+        budget.add(fig)
+    st.plotly_chart(fig, use_container_width=True)
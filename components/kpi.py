@@ -1,5 +1,11 @@
+import html
+from typing import Dict, List
+
 import streamlit as st
 
+from components.markup import content_keys, css_color
+from components.pagination import paginate
+
 
 def render_kpi(title: str, value, subtitle: str | None = None, trend: float | None = None, color: str | None = None) -> None:
     cols = st.columns([3, 1])
@@ -15,3 +21,37 @@ def render_kpi(title: str, value, subtitle: str | None = None, trend: float | No
             st.markdown(f"<div style='text-align:right;color:{trend_color};font-weight:600'>{sign} {abs(trend)}%</div>", unsafe_allow_html=True)
         else:
             st.write(" ")
+
+
+def _kpi_html(kpi: Dict, key: str) -> str:
+    title = html.escape(str(kpi.get("title", "")))
+    value = html.escape(str(kpi.get("value", "")))
+    subtitle = kpi.get("subtitle")
+    trend = kpi.get("trend")
+    color = css_color(kpi.get("color"), "#1f1f1f")
+
+    trend_html = ""
+    if trend is not None:
+        sign = "↑" if trend >= 0 else "↓"
+        trend_color = "#16a34a" if trend >= 0 else "#dc2626"
+        trend_html = f"<div style='text-align:right;color:{trend_color};font-weight:600'>{sign} {abs(trend)}%</div>"
+    subtitle_html = f"<div style='font-size:12px;color:#666'>{html.escape(str(subtitle))}</div>" if subtitle else ""
+    return (
+        f"<div data-key='{key}' style='display:flex;justify-content:space-between;gap:8px;'>"
+        f"<div><strong>{title}</strong><div style='font-size:1.6em;font-weight:600;color:{color}'>{value}</div>{subtitle_html}</div>"
+        f"{trend_html}"
+        "</div>"
+    )
+
+
+def render_kpi_grid(kpis: List[Dict], columns: int = 4, page_size: int = 40, key: str = "kpi_grid") -> None:
+    """Renderiza vários KPIs (dicts com title, value, subtitle, trend, color) em um único bloco HTML."""
+    if not kpis:
+        return
+    # chaves derivadas do conteúdo (`key` explícita ou título), calculadas sobre a lista completa
+    keys = content_keys("kpi", [kpi.get("title", "") for kpi in kpis], [kpi.get("key") for kpi in kpis])
+    items = "".join(_kpi_html(kpi, kpi_key) for kpi, kpi_key in paginate(zip(kpis, keys), page_size, key=f"{key}_page"))
+    st.markdown(
+        f"<div id='{key}' style='display:grid;grid-template-columns:repeat({columns},minmax(0,1fr));gap:16px;'>{items}</div>",
+        unsafe_allow_html=True,
+    )
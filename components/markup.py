@@ -0,0 +1,42 @@
+import html
+import re
+import unicodedata
+from typing import Iterable, List, Optional
+
+# Cores aceitas em atributos `style`: hex, nome, rgb()/rgba()/hsl()/hsla()
+_CSS_COLOR = re.compile(r'#[0-9a-fA-F]{3,8}|[a-zA-Z]+|(rgb|hsl)a?\([0-9.,%\s]+\)')
+
+
+def slugify(text) -> str:
+    """Minúsculas, sem acentos e com tudo que não é letra/dígito virando '-'."""
+    text = unicodedata.normalize('NFKD', str(text).lower())
+    text = ''.join(c for c in text if not unicodedata.combining(c))
+    return re.sub(r'[^a-z0-9]+', '-', text).strip('-')
+
+
+def content_keys(prefix: str, labels: Iterable, ids: Optional[Iterable] = None) -> List[str]:
+    """Chaves estáveis derivadas do conteúdo, uma por item (para `data-key`).
+
+    Usa o id explícito quando houver; senão o slug do rótulo, com um contador de ocorrência
+    apenas quando o slug se repete. Inserir ou remover um item não renomeia os demais.
+    """
+    labels = list(labels)
+    ids = list(ids) if ids is not None else [None] * len(labels)
+    seen = {}
+    keys = []
+    for label, item_id in zip(labels, ids):
+        if item_id is not None:
+            keys.append(f"{prefix}:{html.escape(str(item_id))}")
+            continue
+        slug = slugify(label) or 'item'
+        seen[slug] = seen.get(slug, 0) + 1
+        keys.append(f"{prefix}-{slug}" if seen[slug] == 1 else f"{prefix}-{slug}~{seen[slug]}")
+    return keys
+
+
+def css_color(value, default: str) -> str:
+    """`value` se for uma cor CSS simples; senão `default` (evita injetar CSS/HTML no style)."""
+    if value is None:
+        return default
+    value = str(value).strip()
+    return value if _CSS_COLOR.fullmatch(value) else default
@@ -0,0 +1,15 @@
+import math
+from typing import List, Sequence
+
+import streamlit as st
+
+
+def paginate(items: Sequence, page_size: int, key: str) -> List:
+    """Retorna apenas os itens da página selecionada (o seletor só aparece se houver mais de uma)."""
+    items = list(items)
+    if page_size <= 0 or len(items) <= page_size:
+        return items
+    pages = math.ceil(len(items) / page_size)
+    page = st.number_input(f"Página (1-{pages})", min_value=1, max_value=pages, value=1, step=1, key=key)
+    start = (int(page) - 1) * page_size
+    return items[start:start + page_size]
@@ -0,0 +1,43 @@
+import numpy as np
+
+
+def lttb_indices(y, threshold: int, x=None) -> np.ndarray:
+    """Seleciona os índices de uma série pelo algoritmo LTTB (Largest-Triangle-Three-Buckets).
+
+    Mantém o primeiro e o último ponto e, em cada bucket intermediário, o ponto que forma
+    o maior triângulo com o ponto escolhido no bucket anterior e a média do próximo bucket,
+    preservando picos e vales da série. Se `x` não for informado, usa as posições (0..n-1).
+    """
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.arange(n, dtype=float) if x is None else np.asarray(x, dtype=float)
+    y = np.nan_to_num(y)
+
+    # buckets intermediários (o primeiro e o último ponto ficam fixos)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    indices = np.empty(threshold, dtype=int)
+    indices[0] = 0
+    indices[-1] = n - 1
+
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            next_start, next_end = edges[i + 1], edges[i + 2]
+        else:
+            next_start, next_end = n - 1, n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        areas = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(areas))
+        indices[i + 1] = a
+
+    return indices
+
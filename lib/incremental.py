@@ -0,0 +1,192 @@
+import threading
+from bisect import bisect_left, insort
+from collections import Counter
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple
+
+import pandas as pd
+
+ALL = 'Todos'
+
+# Colunas esperadas no DataFrame de "fatos" (uma linha por linha da planilha):
+# - unidade_pos (str|None), andamento (bool), denominacao (str|None), alunos (int)
+# - inov (bool: linha conta como projeto), ano (str) e as dimensões de contagem da Inovação
+INOV_DIMS = ('unidade', 'via', 'cidade', 'natureza')
+
+
+def row_hashes(df: pd.DataFrame) -> pd.Series:
+    """Hash estável (uint64) do conteúdo de cada linha, independente do índice."""
+    return pd.util.hash_pandas_object(df, index=False)
+
+
+class AggregateSnapshot:
+    """Resultado imutável de um refresh: todas as leituras de um rerun vêm do mesmo dataset."""
+
+    def __init__(
+        self,
+        andamento: Mapping,
+        top: Mapping[str, Tuple[Tuple[int, str], ...]],
+        by_year: Mapping[str, Mapping],
+        total: Mapping[str, Mapping],
+        stats: Mapping[str, int],
+    ):
+        self._andamento = andamento
+        self._top = top
+        self._by_year = by_year
+        self._total = total
+        self.stats = stats
+
+    def count_andamento(self, unidade: str = ALL) -> int:
+        if unidade == ALL:
+            return sum(self._andamento.values())
+        return self._andamento.get(unidade, 0)
+
+    def top_alunos(self, unidade: str = ALL, n: int = 10) -> pd.DataFrame:
+        top = self._top.get(unidade, ())[:n]
+        return pd.DataFrame([(denom, alunos) for alunos, denom in top], columns=['Denominacao', 'Alunos'])
+
+    def counts(self, dim: str, ano: str = ALL) -> pd.DataFrame:
+        """Contagem de projetos por valor de `dim` (colunas: valor, 'Quantidade')."""
+        if ano == ALL:
+            items = list(self._total[dim].items())
+        else:
+            items = [(v, c) for (a, v), c in self._by_year[dim].items() if a == ano]
+        return pd.DataFrame(items, columns=[dim, 'Quantidade'])
+
+
+def _frozen(counter: Counter) -> Mapping:
+    return MappingProxyType({k: c for k, c in counter.items() if c > 0})
+
+
+def _key(value):
+    # groupby/value_counts com dropna=False devolvem NaN onde a linha tinha None
+    return None if value is None or (isinstance(value, float) and value != value) else value
+
+
+def _top_tuples(ranked: pd.DataFrame) -> Tuple[Tuple[int, str], ...]:
+    return tuple(zip(ranked['alunos'].tolist(), ranked['denominacao'].tolist()))
+
+
+def snapshot_from_facts(facts: pd.DataFrame, top_n: int = 10) -> AggregateSnapshot:
+    """Calcula o `AggregateSnapshot` de `facts` de uma vez (groupby), sem estado incremental.
+
+    Para subconjuntos efêmeros (ex.: linhas de uma busca), em que não há versão anterior a
+    aproveitar. O resultado é o mesmo de `IncrementalAggregates().refresh(facts, top_n)`.
+    """
+    andamento = facts.loc[facts['andamento'].astype(bool), 'unidade_pos'].value_counts(dropna=False, sort=False)
+
+    ranked = facts[facts['denominacao'].notna() & (facts['alunos'] > 0)]
+    ranked = pd.DataFrame({
+        'unidade_pos': ranked['unidade_pos'],
+        'alunos': ranked['alunos'].astype('int64'),
+        'denominacao': ranked['denominacao'].astype(str).astype(object),
+    }).sort_values(['alunos', 'denominacao'], ascending=[False, True], kind='stable')
+    top = {ALL: _top_tuples(ranked.head(top_n))}
+    for unidade, group in ranked.groupby('unidade_pos', dropna=False, sort=False):
+        top[_key(unidade)] = _top_tuples(group.head(top_n))
+
+    inov = facts[facts['inov'].astype(bool)]
+    by_year, total = {}, {}
+    for dim in INOV_DIMS:
+        present = inov[inov[dim].notna()]
+        year_counts = present.groupby(['ano', dim], sort=False).size()
+        by_year[dim] = MappingProxyType({k: int(c) for k, c in year_counts.items()})
+        total[dim] = MappingProxyType({k: int(c) for k, c in present[dim].value_counts(sort=False).items()})
+
+    return AggregateSnapshot(
+        andamento=MappingProxyType({_key(k): int(c) for k, c in andamento.items()}),
+        top=MappingProxyType(top),
+        by_year=MappingProxyType(by_year),
+        total=MappingProxyType(total),
+        stats=MappingProxyType({'inserted': len(facts), 'deleted': 0}),
+    )
+
+
+class IncrementalAggregates:
+    """Mantém as agregações do dashboard e aplica apenas as linhas alteradas a cada refresh.
+
+    A identidade de uma linha é o hash do seu conteúdo: uma linha editada aparece como uma
+    remoção (hash antigo) mais uma inserção (hash novo). Linhas idênticas são tratadas como
+    multiconjunto. O custo de aplicar um refresh é proporcional ao tamanho da edição; só o
+    hash e o diff (vetorizados) percorrem a planilha inteira.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._columns: Optional[Tuple[str, ...]] = None
+        self._multiplicity = pd.Series(dtype='int64', index=pd.Index([], dtype='uint64'))
+        self._rows: Dict[int, Dict] = {}
+        self._andamento: Counter = Counter()
+        # listas ordenadas de (-alunos, denominacao, hash) por unidade e geral (ALL)
+        self._top: Dict[str, List[Tuple[int, str, int]]] = {ALL: []}
+        # contagens da Inovação por (ano, valor) e por valor (todos os anos)
+        self._by_year: Dict[str, Counter] = {dim: Counter() for dim in INOV_DIMS}
+        self._total: Dict[str, Counter] = {dim: Counter() for dim in INOV_DIMS}
+
+    def refresh(self, facts: pd.DataFrame, top_n: int = 10) -> AggregateSnapshot:
+        """Sincroniza as agregações com `facts` e retorna um `AggregateSnapshot` desse estado.
+
+        O snapshot guarda só o top `top_n` de cada unidade, então copiá-lo custa o número de
+        chaves distintas, não o número de linhas. `snapshot.stats` traz {'inserted', 'deleted'}.
+        """
+        hashes = row_hashes(facts)
+        counts = hashes.value_counts()
+
+        with self._lock:
+            if self._columns != tuple(facts.columns):
+                self._reset()
+                self._columns = tuple(facts.columns)
+
+            delta = counts.sub(self._multiplicity, fill_value=0).astype('int64')
+            delta = delta[delta != 0]
+            inserted = delta[delta > 0]
+            deleted = delta[delta < 0]
+
+            for h, k in deleted.items():
+                row = self._rows[h]
+                self._apply(row, h, int(k))
+                if h not in counts.index:
+                    del self._rows[h]
+
+            if not inserted.empty:
+                new_rows = facts[hashes.isin(inserted.index)]
+                new_rows = new_rows[~hashes[new_rows.index].duplicated()]
+                for h, row in zip(hashes[new_rows.index], new_rows.to_dict('records')):
+                    self._rows[h] = row
+                    self._apply(row, h, int(inserted[h]))
+
+            self._multiplicity = counts
+            return AggregateSnapshot(
+                andamento=_frozen(self._andamento),
+                top=MappingProxyType({
+                    key: tuple((-neg, denom) for neg, denom, _ in lst[:top_n]) for key, lst in self._top.items()
+                }),
+                by_year=MappingProxyType({dim: _frozen(c) for dim, c in self._by_year.items()}),
+                total=MappingProxyType({dim: _frozen(c) for dim, c in self._total.items()}),
+                stats=MappingProxyType({'inserted': int(inserted.sum()), 'deleted': int(-deleted.sum())}),
+            )
+
+    def _apply(self, row: Dict, h: int, k: int) -> None:
+        # k > 0 insere k cópias da linha, k < 0 remove
+        if row['andamento']:
+            self._andamento[row['unidade_pos']] += k
+
+        if row['denominacao'] is not None and row['alunos'] > 0:
+            entry = (-row['alunos'], str(row['denominacao']), h)
+            for key in (ALL, row['unidade_pos']):
+                lst = self._top.setdefault(key, [])
+                for _ in range(abs(k)):
+                    if k > 0:
+                        insort(lst, entry)
+                    else:
+                        del lst[bisect_left(lst, entry)]
+
+        if row['inov']:
+            for dim in INOV_DIMS:
+                value = row[dim]
+                if value is not None:
+                    self._by_year[dim][(row['ano'], value)] += k
+                    self._total[dim][value] += k
@@ -0,0 +1,102 @@
+import re
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, Iterable, List, Set
+
+import pandas as pd
+
+from busca_dados import _normalize_title
+
+_SPLIT = re.compile(r'[\W_]+')
+
+
+def tokenize(text) -> List[str]:
+    """Minúsculas, sem acentos e separado em tudo que não é letra/dígito (como `_normalize_col`)."""
+    return [t for t in _SPLIT.split(_normalize_title(str(text))) if t]
+
+
+def _deletes(word: str) -> Set[str]:
+    return {word} | {word[:i] + word[i + 1:] for i in range(len(word))}
+
+
+def _within_one_edit(a: str, b: str) -> bool:
+    # distância de Damerau-Levenshtein <= 1 (inserção, remoção, troca ou transposição)
+    if a == b:
+        return True
+    la, lb = len(a), len(b)
+    if abs(la - lb) > 1:
+        return False
+    if la == lb:
+        diff = [i for i in range(la) if a[i] != b[i]]
+        if len(diff) == 1:
+            return True
+        return len(diff) == 2 and diff[1] == diff[0] + 1 and a[diff[0]] == b[diff[1]] and a[diff[1]] == b[diff[0]]
+    if la > lb:
+        a, b = b, a
+    i = 0
+    while i < len(a) and a[i] == b[i]:
+        i += 1
+    return a[i:] == b[i + 1:]
+
+
+class SearchIndex:
+    """Índice invertido (token -> ids das linhas) com busca por prefixo e tolerância a 1 erro.
+
+    Todos os termos da consulta precisam casar (E); cada termo casa com tokens iguais, que
+    começam com ele (a partir de `min_prefix_len` letras) ou, a partir de `min_fuzzy_len`
+    letras, que estão a uma edição de distância (números não têm tolerância a erro).
+    """
+
+    def __init__(self, min_prefix_len: int = 2, min_fuzzy_len: int = 4):
+        self.min_prefix_len = min_prefix_len
+        self.min_fuzzy_len = min_fuzzy_len
+        self._postings: Dict[str, Set] = defaultdict(set)
+        self._vocab: List[str] = []
+        self._deletes: Dict[str, Set[str]] = defaultdict(set)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, columns: Iterable[str], **kwargs) -> 'SearchIndex':
+        """Indexa as colunas informadas; os ids são os rótulos do índice do DataFrame."""
+        index = cls(**kwargs)
+        for col in columns:
+            # tokeniza cada valor distinto uma única vez (unidade e cidade se repetem muito)
+            for value, ids in df.groupby(col, sort=False).groups.items():
+                index.add(ids, value)
+        index.build()
+        return index
+
+    def add(self, ids: Iterable, text) -> None:
+        for token in tokenize(text):
+            self._postings[token].update(ids)
+
+    def build(self) -> None:
+        self._vocab = sorted(self._postings)
+        self._deletes = defaultdict(set)
+        for word in self._vocab:
+            if len(word) >= self.min_fuzzy_len and not word.isdigit():
+                for d in _deletes(word):
+                    self._deletes[d].add(word)
+
+    def _expand(self, term: str) -> Set[str]:
+        words = {term} if term in self._postings else set()
+        if len(term) >= self.min_prefix_len:
+            i = bisect_left(self._vocab, term)
+            while i < len(self._vocab) and self._vocab[i].startswith(term):
+                words.add(self._vocab[i])
+                i += 1
+        if len(term) >= self.min_fuzzy_len and not term.isdigit():
+            for d in _deletes(term):
+                words.update(w for w in self._deletes.get(d, ()) if _within_one_edit(term, w))
+        return words
+
+    def search(self, query: str) -> Set:
+        """Ids das linhas que casam com todos os termos de `query` (vazio se não houver termos)."""
+        result = None
+        for term in tokenize(query):
+            ids = set()
+            for word in self._expand(term):
+                ids |= self._postings[word]
+            result = ids if result is None else result & ids
+            if not result:
+                return set()
+        return result or set()
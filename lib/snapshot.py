@@ -0,0 +1,149 @@
+"""Snapshot compartilhado dos dados em Arrow IPC, mapeado em memória por vários processos.
+
+Um processo publica `snapshot-<versao>.arrow` e troca atomicamente o ponteiro `CURRENT`
+(escrita em arquivo temporário + `os.replace`). Os demais leem o ponteiro a cada rerun e
+anexam a versão atual via `pyarrow.memory_map`: a tabela Arrow usa os buffers do arquivo,
+sem cópia. Na conversão para pandas as colunas de texto só continuam sobre esses buffers
+com pandas >= 3 (texto em Arrow); em versões anteriores, e para colunas numéricas com
+nulos, a conversão copia. Uma trava do sistema operacional sobre `publish.lock` garante que
+só um processo busque a planilha por vez.
+"""
+import os
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional, Union
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+POINTER = 'CURRENT'
+LOCK = 'publish.lock'
+KEEP_VERSIONS = 3
+
+
+def _to_table(df: pd.DataFrame) -> pa.Table:
+    # Colunas com tipos mistos (ex.: gspread devolve números e textos na mesma coluna)
+    # viram texto, preservando os nulos
+    columns = {}
+    for col in df.columns:
+        s = df[col]
+        try:
+            columns[str(col)] = pa.array(s, from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            columns[str(col)] = pa.array(s.where(s.isna(), s.astype(str)), type=pa.string(), from_pandas=True)
+    return pa.table(columns)
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    tmp = path.with_name(f'.{path.name}.{uuid.uuid4().hex}.tmp')
+    with open(tmp, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def publish_snapshot(df: pd.DataFrame, directory: Union[str, Path]) -> str:
+    """Grava o DataFrame como nova versão e aponta `CURRENT` para ela. Retorna a versão."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    version = f'{time.time_ns()}-{os.getpid()}'
+    path = directory / f'snapshot-{version}.arrow'
+
+    table = _to_table(df)
+    tmp = path.with_name(f'.{path.name}.tmp')
+    with pa.OSFile(str(tmp), 'wb') as sink:
+        with ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp, path)
+
+    _write_atomic(directory / POINTER, version.encode('utf-8'))
+    _cleanup(directory, version)
+    return version
+
+
+def _cleanup(directory: Path, current: str) -> None:
+    # Mantém as últimas versões; processos que ainda mapeiam uma versão antiga continuam
+    # lendo (POSIX). No Windows o arquivo mapeado não pode ser removido e fica para depois.
+    snapshots = sorted(
+        directory.glob('snapshot-*.arrow'), key=lambda p: (p.stat().st_mtime_ns, p.name), reverse=True
+    )
+    for path in snapshots[KEEP_VERSIONS:]:
+        if current in path.name:
+            continue
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+
+def current_version(directory: Union[str, Path]) -> Optional[str]:
+    try:
+        return (Path(directory) / POINTER).read_text(encoding='utf-8').strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def wait_for_version(directory: Union[str, Path], timeout: float, interval: float = 0.2) -> Optional[str]:
+    """Aguarda até `timeout` segundos por uma versão publicada (partida a frio)."""
+    deadline = time.monotonic() + timeout
+    while True:
+        version = current_version(directory)
+        if version is not None or time.monotonic() >= deadline:
+            return version
+        time.sleep(interval)
+
+
+def snapshot_age(directory: Union[str, Path]) -> float:
+    """Segundos desde a última publicação (infinito se não houver snapshot)."""
+    try:
+        return time.time() - (Path(directory) / POINTER).stat().st_mtime
+    except FileNotFoundError:
+        return float('inf')
+
+
+def attach_snapshot(directory: Union[str, Path], version: str) -> pa.Table:
+    """Abre a versão informada mapeada em memória (os buffers da tabela apontam para o arquivo)."""
+    source = pa.memory_map(str(Path(directory) / f'snapshot-{version}.arrow'), 'r')
+    return ipc.open_file(source).read_all()
+
+
+@contextmanager
+def publish_lock(directory: Union[str, Path]) -> Iterator[bool]:
+    """Tenta obter a trava de publicação sem bloquear; produz True se este processo a obteve.
+
+    A trava é do sistema operacional (`flock`/`msvcrt.locking`) e é liberada quando o
+    processo termina, então não há trava abandonada a remover. O arquivo nunca é apagado:
+    apagá-lo permitiria que dois processos travassem arquivos diferentes.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    fd = os.open(directory / LOCK, os.O_CREAT | os.O_RDWR)
+    try:
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+            acquired = True
+        except OSError:
+            acquired = False
+        try:
+            yield acquired
+        finally:
+            if acquired and fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            elif acquired:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+    finally:
+        os.close(fd)
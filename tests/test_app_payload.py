@@ -0,0 +1,69 @@
+from pathlib import Path
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+import app
+from components import figures
+from tools.load_test import make_dataset
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture
+def strict_app(tmp_path, monkeypatch):
+    """`app.py` lendo um CSV sintético (sem rede), com os orçamentos de payload estritos."""
+    csv = tmp_path / 'dados.csv'
+    make_dataset(3000, seed=1).to_csv(csv, sep=';', index=False)
+    monkeypatch.setenv('DADOS_CSV', str(csv))
+    monkeypatch.delenv('GOOGLE_SERVICE_ACCOUNT_FILE', raising=False)
+    monkeypatch.delenv('SNAPSHOT_DIR', raising=False)
+
+    def offline(*_args, **_kwargs):
+        raise ConnectionError('teste: rede desativada')
+
+    monkeypatch.setattr('requests.get', offline)
+    monkeypatch.setattr(figures, 'STRICT_PAYLOAD', True)
+
+    totals = {}
+    add = figures.PayloadBudget.add
+
+    def recording_add(self, fig):
+        size = add(self, fig)
+        totals[self.view] = self.total
+        return size
+
+    monkeypatch.setattr(figures.PayloadBudget, 'add', recording_add)
+    at = AppTest.from_file(str(ROOT / 'app.py'), default_timeout=60)
+    return at, totals
+
+
+def _check(at, totals):
+    # no modo estrito um excesso vira exceção no app; os totais confirmam que houve medição
+    assert not at.exception, [e.message for e in at.exception]
+    assert totals
+    assert totals.get('Pós Lato-Sensu', 0) <= app.POS_PAYLOAD_BUDGET
+    assert totals.get('Inovação', 0) <= app.INOV_PAYLOAD_BUDGET
+
+
+def test_views_fit_payload_budgets(strict_app):
+    at, totals = strict_app
+    at.run()
+    _check(at, totals)
+    assert set(totals) == {'Pós Lato-Sensu', 'Inovação'}
+    assert [m.value for m in at.metric if m.label == 'Total de Projetos'] == ['2000']
+
+    for unidade in at.selectbox(key='unidade_pos').options[:3]:
+        at.selectbox(key='unidade_pos').set_value(unidade)
+        for ano in at.selectbox(key='ano_inov').options[:3]:
+            totals.clear()
+            at.selectbox(key='ano_inov').set_value(ano).run()
+            _check(at, totals)
+
+
+def test_search_fits_payload_budgets(strict_app):
+    at, totals = strict_app
+    at.run()
+    totals.clear()
+    at.text_input(key='busca').input('recife').run()
+    _check(at, totals)
@@ -0,0 +1,70 @@
+import random
+
+import numpy as np
+import plotly.io as pio
+
+from components import charts
+from lib.downsample import lttb_indices
+
+
+def test_lttb_length_and_endpoints():
+    y = np.sin(np.linspace(0, 50, 20000)) + np.random.default_rng(0).random(20000)
+    idx = lttb_indices(y, 800)
+    assert len(idx) == 800
+    assert idx[0] == 0
+    assert idx[-1] == len(y) - 1
+    assert np.all(np.diff(idx) > 0)
+
+
+def test_lttb_keeps_peak():
+    y = np.zeros(10000)
+    y[4321] = 100.0
+    assert 4321 in lttb_indices(y, 50)
+
+
+def test_lttb_short_series_unchanged():
+    assert list(lttb_indices([1, 2, 3], 10)) == [0, 1, 2]
+
+
+def _render(monkeypatch, months: int, traces: int, spikes=()):
+    figures = []
+    monkeypatch.setattr(charts, 'plot', lambda fig, budget=None: figures.append(fig))
+    rnd = random.Random(0)
+    monthly = [
+        {'month': f'd{d}', **{f'coord{i+1}': rnd.randint(0, 100) for i in range(traces)}}
+        for d in range(months)
+    ]
+    for d in spikes:
+        monthly[d]['coord1'] = 10_000
+    charts.render_performance_monthly(monthly, [f'C{i}' for i in range(traces)], ['#000'])
+    return figures[0]
+
+
+def test_performance_payload_at_large_input(monkeypatch):
+    fig = _render(monkeypatch, months=1800, traces=40)
+    size = len(pio.to_json(fig, validate=False))
+    assert size < charts.RENDER_ALL_PAYLOAD_BUDGET
+    assert sum(len(t.y) for t in fig.data) <= 8000
+    assert all(t.type == 'scattergl' for t in fig.data)
+
+
+def test_performance_keeps_peaks_with_many_traces(monkeypatch):
+    spikes = list(range(30, 1800, 60))
+    fig = _render(monkeypatch, months=1800, traces=40, spikes=spikes)
+    kept = {x for x, y in zip(fig.data[0].x, fig.data[0].y) if y == 10_000}
+    assert kept == {f'd{d}' for d in spikes}
+    assert all(len(t.y) == 8000 // 40 for t in fig.data)
+
+
+def test_performance_category_order_is_fixed(monkeypatch):
+    fig = _render(monkeypatch, months=1800, traces=40)
+    assert list(fig.layout.xaxis.categoryarray) == [f'd{d}' for d in range(1800)]
+    for trace in fig.data:
+        positions = [int(label[1:]) for label in trace.x]
+        assert positions == sorted(positions)
+
+
+def test_performance_small_series_not_downsampled(monkeypatch):
+    fig = _render(monkeypatch, months=12, traces=4)
+    assert all(len(t.y) == 12 for t in fig.data)
+    assert all(t.type == 'scatter' for t in fig.data)
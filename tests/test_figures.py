@@ -0,0 +1,40 @@
+import pandas as pd
+import pytest
+
+from components import figures
+
+
+def _panel(n, scale, orientation='v'):
+    data = pd.DataFrame({'nome': [f'n{i}' for i in range(n)], 'Quantidade': [scale * (i + 1) for i in range(n)]})
+    if orientation == 'h':
+        return dict(data=data, x='Quantidade', y='nome', orientation='h')
+    return dict(data=data, x='nome', y='Quantidade')
+
+
+def test_bar_grid_gives_each_panel_its_own_coloraxis():
+    fig = figures.bar_grid([_panel(15, 1, 'h'), _panel(4, 100)], cols=2)
+    assert [t.marker.coloraxis for t in fig.data] == ['coloraxis', 'coloraxis2']
+    template = fig.layout.template.layout
+    assert template.coloraxis.colorscale == template.coloraxis2.colorscale
+    assert fig.layout.coloraxis.colorbar.x < fig.layout.coloraxis2.colorbar.x
+
+
+def test_bar_grid_rejects_too_many_panels():
+    with pytest.raises(ValueError):
+        figures.bar_grid([_panel(2, 1)] * (figures.MAX_PANELS + 1))
+
+
+def test_payload_budget_only_measures_when_enabled(monkeypatch):
+    fig = figures.bar_figure(_panel(3, 1)['data'], x='nome', y='Quantidade')
+    monkeypatch.setattr(figures, 'CHECK_PAYLOAD', False)
+    budget = figures.PayloadBudget('teste', limit_bytes=10)
+    assert budget.add(fig) == 0 and budget.total == 0
+
+    strict = figures.PayloadBudget('teste', limit_bytes=10, strict=True)
+    with pytest.raises(RuntimeError):
+        strict.add(fig)
+
+
+def test_dashboard_template_is_compact():
+    fig = figures.bar_figure(_panel(8, 1)['data'], x='nome', y='Quantidade')
+    assert figures.payload_size(fig) < 2000
@@ -0,0 +1,82 @@
+import re
+
+import pytest
+
+from components import coordination_card, kpi, pagination
+from components.markup import content_keys, css_color
+
+
+@pytest.fixture
+def page(monkeypatch):
+    """Página escolhida no seletor de `paginate` (o número de páginas fica em `calls`)."""
+    state = {'page': 1, 'calls': []}
+
+    def number_input(label, min_value, max_value, value, step, key):
+        state['calls'].append((max_value, key))
+        return state['page']
+
+    monkeypatch.setattr(pagination.st, 'number_input', number_input)
+    return state
+
+
+def _markup(monkeypatch, module):
+    out = []
+    monkeypatch.setattr(module.st, 'markdown', lambda body, **_kwargs: out.append(body))
+    return out
+
+
+def _keys(markup):
+    return re.findall(r"data-key='([^']*)'", markup)
+
+
+def test_paginate_single_page_has_no_selector(page):
+    assert pagination.paginate(range(5), 10, key='p') == [0, 1, 2, 3, 4]
+    assert pagination.paginate(range(5), 0, key='p') == [0, 1, 2, 3, 4]
+    assert page['calls'] == []
+
+
+def test_paginate_returns_selected_page(page):
+    page['page'] = 3
+    assert pagination.paginate(range(25), 10, key='p') == list(range(20, 25))
+    assert page['calls'] == [(3, 'p')]
+
+
+def test_coordination_grid_emits_one_page(monkeypatch, page):
+    out = _markup(monkeypatch, coordination_card)
+    coords = [{'name': f'Coordenação {i}', 'budget': 10, 'spent': 5} for i in range(30)]
+    page['page'] = 2
+    coordination_card.render_coordination_grid(coords, ['#123456'], page_size=24)
+    assert len(out) == 1
+    assert _keys(out[0]) == [f'coord-coordenacao-{i}' for i in range(24, 30)]
+
+
+def test_kpi_grid_emits_one_page(monkeypatch, page):
+    out = _markup(monkeypatch, kpi)
+    kpi.render_kpi_grid([{'title': f'KPI {i}', 'value': i} for i in range(50)], page_size=40)
+    assert len(out) == 1
+    assert len(_keys(out[0])) == 40
+
+
+def test_keys_unique_and_stable_on_insert():
+    names = ['Pós', 'Inovação', 'Pos', 'Extensão']
+    before = content_keys('coord', names)
+    assert len(set(before)) == len(before)
+    assert before == ['coord-pos', 'coord-inovacao', 'coord-pos~2', 'coord-extensao']
+
+    after = content_keys('coord', ['Pesquisa'] + names[:1] + ['Graduação'] + names[1:])
+    assert set(before) <= set(after)
+    assert len(set(after)) == len(after)
+
+
+def test_explicit_ids_do_not_collide_with_slugs():
+    keys = content_keys('kpi', ['A', 'B', ''], ids=['a', None, None])
+    assert keys == ['kpi:a', 'kpi-b', 'kpi-item']
+
+
+def test_color_cannot_escape_style(monkeypatch, page):
+    assert css_color('rgb(22, 163, 74)', '#ddd') == 'rgb(22, 163, 74)'
+    assert css_color("red;background:url(x)", '#ddd') == '#ddd'
+    out = _markup(monkeypatch, kpi)
+    kpi.render_kpi_grid([{'title': 'T', 'value': 1, 'color': "#fff'><script>"}])
+    assert '<script>' not in out[0]
+    assert 'color:#1f1f1f' in out[0]
@@ -0,0 +1,62 @@
+import pandas as pd
+
+from lib.incremental import ALL, IncrementalAggregates, snapshot_from_facts
+
+
+def _facts(rows):
+    columns = ['unidade_pos', 'andamento', 'denominacao', 'alunos', 'inov', 'ano', 'unidade', 'via', 'cidade', 'natureza']
+    return pd.DataFrame(rows, columns=columns)
+
+
+POS_A = ('POLI', True, 'Curso A', 30, False, 'nan', None, None, None, None)
+POS_B = ('FCM', False, 'Curso B', 50, False, 'nan', None, None, None, None)
+INOV_1 = (None, False, None, 0, True, '2020', 'POLI', 'UPE', 'Recife', 'PD&I')
+INOV_2 = (None, False, None, 0, True, '2021', 'FCM', 'IAUPE', 'Olinda', 'PD&I')
+
+
+def _state(snapshot, unidade=ALL, ano=ALL):
+    counts = {
+        dim: dict(zip(*[snapshot.counts(dim, ano)[c] for c in (dim, 'Quantidade')]))
+        for dim in ('unidade', 'via', 'cidade', 'natureza')
+    }
+    return snapshot.count_andamento(unidade), snapshot.top_alunos(unidade).values.tolist(), counts
+
+
+def test_refresh_applies_only_the_diff():
+    agg = IncrementalAggregates()
+    first = agg.refresh(_facts([POS_A, POS_B, INOV_1, INOV_1]))
+    assert dict(first.stats) == {'inserted': 4, 'deleted': 0}
+
+    edited = (POS_B[:3] + (5,) + POS_B[4:])
+    second = agg.refresh(_facts([POS_A, edited, INOV_1, INOV_2]))
+    assert dict(second.stats) == {'inserted': 2, 'deleted': 2}
+
+    fresh = IncrementalAggregates().refresh(_facts([POS_A, edited, INOV_1, INOV_2]))
+    for unidade in (ALL, 'POLI', 'FCM'):
+        for ano in (ALL, '2020', '2021'):
+            assert _state(second, unidade, ano) == _state(fresh, unidade, ano)
+    assert second.top_alunos().values.tolist() == [['Curso A', 30], ['Curso B', 5]]
+    assert second.counts('natureza')['Quantidade'].tolist() == [2]
+
+
+def test_snapshot_is_not_affected_by_later_refresh():
+    agg = IncrementalAggregates()
+    old = agg.refresh(_facts([POS_A, INOV_1]))
+    agg.refresh(_facts([POS_B, INOV_2, INOV_2]))
+    assert old.count_andamento() == 1
+    assert old.top_alunos().values.tolist() == [['Curso A', 30]]
+    assert old.counts('cidade').values.tolist() == [['Recife', 1]]
+
+
+def test_snapshot_from_facts_matches_incremental():
+    POS_C = ('POLI', True, 'Curso C', 30, False, 'nan', None, None, None, None)
+    NO_UNIT = (None, True, 'Curso D', 7, False, 'nan', None, None, None, None)
+    INOV_3 = (None, False, None, 0, True, '2020', 'POLI', 'FACEPE', 'Recife', 'RESITEC')
+    facts = _facts([POS_A, POS_B, POS_C, NO_UNIT, POS_A, INOV_1, INOV_2, INOV_3])
+    expected = IncrementalAggregates().refresh(facts, top_n=2)
+    batch = snapshot_from_facts(facts, top_n=2)
+    for unidade in (ALL, 'POLI', 'FCM', 'ESEF'):
+        for ano in (ALL, '2020', '2021', '2019'):
+            assert _state(batch, unidade, ano) == _state(expected, unidade, ano)
+    assert batch.top_alunos('POLI').values.tolist() == [['Curso A', 30], ['Curso A', 30]]
+    assert snapshot_from_facts(facts.iloc[:0]).count_andamento() == 0
@@ -0,0 +1,94 @@
+import itertools
+import random
+
+import pandas as pd
+
+from lib.incremental import ALL, snapshot_from_facts
+from lib.search import SearchIndex, _within_one_edit, tokenize
+
+
+def _index():
+    df = pd.DataFrame({
+        'PROJETO': ['Sistema de Irrigação', 'Plataforma Educação', 'Sensor IoT 2023', None],
+        'CIDADE': ['Nazaré da Mata', 'Recife', 'Recife', 'Olinda'],
+    })
+    return SearchIndex.from_frame(df, ['PROJETO', 'CIDADE'])
+
+
+def _damerau(a: str, b: str) -> int:
+    # distância de Damerau-Levenshtein (transposições adjacentes), por programação dinâmica
+    d = [[0] * (len(b) + 1) for _ in range(len(a) + 1)]
+    for i in range(len(a) + 1):
+        d[i][0] = i
+    for j in range(len(b) + 1):
+        d[0][j] = j
+    for i, j in itertools.product(range(1, len(a) + 1), range(1, len(b) + 1)):
+        cost = a[i - 1] != b[j - 1]
+        d[i][j] = min(d[i - 1][j] + 1, d[i][j - 1] + 1, d[i - 1][j - 1] + cost)
+        if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+            d[i][j] = min(d[i][j], d[i - 2][j - 2] + 1)
+    return d[-1][-1]
+
+
+def test_tokenize_folds_accents_and_case():
+    assert tokenize('Nazaré da MATA/PE') == ['nazare', 'da', 'mata', 'pe']
+
+
+def test_accent_and_case_insensitive():
+    index = _index()
+    assert index.search('NAZARÉ') == {0}
+    assert index.search('educacao') == {1}
+
+
+def test_prefix_match():
+    index = _index()
+    assert index.search('plat') == {1}
+    assert index.search('rec') == {1, 2}
+    # abaixo de min_prefix_len só casa o token exato
+    assert index.search('r') == set()
+
+
+def test_single_typo():
+    index = _index()
+    assert index.search('nazre') == {0}
+    assert index.search('irirgacao') == {0}
+    assert index.search('olnda') == {3}
+    assert index.search('nzre') == set()
+
+
+def test_numbers_are_not_fuzzy():
+    index = _index()
+    assert index.search('2023') == {2}
+    assert index.search('2024') == set()
+    assert index.search('2032') == set()
+
+
+def test_terms_are_anded():
+    index = _index()
+    assert index.search('recife sensor') == {2}
+    assert index.search('recife irrigacao') == set()
+    assert index.search('  ') == set()
+
+
+def test_within_one_edit_matches_damerau():
+    rnd = random.Random(0)
+    for _ in range(3000):
+        a = ''.join(rnd.choice('abc') for _ in range(rnd.randint(0, 5)))
+        b = ''.join(rnd.choice('abc') for _ in range(rnd.randint(0, 5)))
+        assert _within_one_edit(a, b) == (_damerau(a, b) <= 1), (a, b)
+
+
+def test_no_hits_give_empty_aggregate():
+    columns = ['unidade_pos', 'andamento', 'denominacao', 'alunos', 'inov', 'ano', 'unidade', 'via', 'cidade', 'natureza']
+    facts = pd.DataFrame([
+        ('POLI', True, 'Curso A', 30, False, 'nan', None, None, None, None),
+        (None, False, None, 0, True, '2020', 'POLI', 'UPE', 'Recife', 'PD&I'),
+        (None, False, None, 0, True, '2021', 'FCM', 'IAUPE', 'Olinda', 'PD&I'),
+    ], columns=columns)
+    ids = SearchIndex.from_frame(pd.DataFrame({'P': ['Curso A', None, None]}), ['P']).search('inexistente')
+    empty = snapshot_from_facts(facts[facts.index.isin(list(ids))])
+    assert empty.count_andamento() == 0
+    assert empty.top_alunos(ALL).empty
+    for dim in ('unidade', 'via', 'cidade', 'natureza'):
+        assert empty.counts(dim).empty
+        assert empty.counts(dim, '2020').empty
@@ -0,0 +1,90 @@
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from lib import snapshot
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _try_lock_in_subprocess(directory) -> bool:
+    code = (
+        'import sys; from lib import snapshot\n'
+        'with snapshot.publish_lock(sys.argv[1]) as acquired:\n'
+        '    print(acquired)\n'
+    )
+    out = subprocess.run([sys.executable, '-c', code, str(directory)], cwd=ROOT, capture_output=True, text=True, check=True)
+    return out.stdout.strip() == 'True'
+
+
+def test_publish_attach_round_trip(tmp_path):
+    df = pd.DataFrame({'UNIDADE': ['POLI', None, 'FCM'], 'ALUNOS': [10, 20, 30], 'VALOR': [1.5, np.nan, 3.0]})
+    version = snapshot.publish_snapshot(df, tmp_path)
+    assert snapshot.current_version(tmp_path) == version
+    assert snapshot.snapshot_age(tmp_path) < 60
+    assert not list(tmp_path.glob('.*.tmp'))
+
+    table = snapshot.attach_snapshot(tmp_path, version)
+    back = table.to_pandas()
+    assert back['UNIDADE'].tolist()[::2] == ['POLI', 'FCM']
+    assert back['UNIDADE'].isna().tolist() == [False, True, False]
+    assert back['ALUNOS'].tolist() == [10, 20, 30]
+    assert back['VALOR'].isna().tolist() == [False, True, False]
+
+
+def test_mixed_type_columns_become_text(tmp_path):
+    df = pd.DataFrame({'ANO': pd.Series([2020, '2021', None], dtype=object)})
+    version = snapshot.publish_snapshot(df, tmp_path)
+    back = snapshot.attach_snapshot(tmp_path, version).to_pandas()
+    assert back['ANO'].tolist()[:2] == ['2020', '2021']
+    assert back['ANO'].isna().tolist() == [False, False, True]
+
+
+def test_pointer_swap_and_cleanup(tmp_path):
+    df = pd.DataFrame({'a': [1]})
+    versions = [snapshot.publish_snapshot(df, tmp_path) for _ in range(snapshot.KEEP_VERSIONS + 2)]
+    assert snapshot.current_version(tmp_path) == versions[-1]
+    kept = sorted(p.name for p in tmp_path.glob('snapshot-*.arrow'))
+    assert kept == sorted(f'snapshot-{v}.arrow' for v in versions[-snapshot.KEEP_VERSIONS:])
+
+
+def test_missing_snapshot(tmp_path):
+    assert snapshot.current_version(tmp_path) is None
+    assert snapshot.snapshot_age(tmp_path) == float('inf')
+    start = time.monotonic()
+    assert snapshot.wait_for_version(tmp_path, timeout=0.3, interval=0.05) is None
+    assert time.monotonic() - start >= 0.3
+
+
+def test_wait_for_first_publish(tmp_path):
+    timer = threading.Timer(0.2, snapshot.publish_snapshot, args=(pd.DataFrame({'a': [1]}), tmp_path))
+    timer.start()
+    try:
+        version = snapshot.wait_for_version(tmp_path, timeout=10, interval=0.05)
+    finally:
+        timer.join()
+    assert version == snapshot.current_version(tmp_path)
+
+
+def test_lock_is_exclusive(tmp_path):
+    with snapshot.publish_lock(tmp_path) as first:
+        assert first
+        with snapshot.publish_lock(tmp_path) as second:
+            assert not second
+        assert not _try_lock_in_subprocess(tmp_path)
+    with snapshot.publish_lock(tmp_path) as again:
+        assert again
+
+
+def test_lock_released_when_process_exits(tmp_path):
+    # um processo que termina (mesmo sem sair do `with`) não deixa a trava presa
+    assert _try_lock_in_subprocess(tmp_path)
+    code = 'import os, sys; from lib import snapshot\nwith snapshot.publish_lock(sys.argv[1]):\n    os._exit(0)\n'
+    subprocess.run([sys.executable, '-c', code, str(tmp_path)], cwd=ROOT, check=True)
+    with snapshot.publish_lock(tmp_path) as acquired:
+        assert acquired
@@ -0,0 +1,233 @@
+"""Teste de carga headless do dashboard (app.py) com várias sessões simultâneas.
+
+Cada sessão é um `streamlit.testing.v1.AppTest` rodando em uma thread do mesmo processo,
+como as sessões de um servidor Streamlit (compartilham `st.cache_data`/`st.cache_resource`).
+A planilha é substituída por dados sintéticos locais, então nenhuma chamada de rede é feita.
+
+Uso:
+    python tools/load_test.py --sessions 50 --steps 10
+    python tools/load_test.py --source csv --rows 20000 --json resultado.json
+
+Fontes de dados (`--source`):
+- sheets: caminho com service account; `busca_dados.fetch_coord_data` devolve o DataFrame
+  sintético (com `--sheet-latency` simulando a demora da API) e passa pelo `st.cache_data`.
+- csv: sem credenciais e sem rede (`requests.get` falha), forçando o fallback para o CSV
+  local, gravado em um arquivo temporário apontado por `DADOS_CSV`.
+
+Os orçamentos de payload de cada aba são estritos durante o teste (como `CHECK_PAYLOAD=strict`):
+uma view acima do orçamento conta em `errors`. Use `--lenient-payload` para desligar.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+import busca_dados  # noqa: E402
+from components import figures  # noqa: E402
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+UNIDADES = ['POLI', 'FCM', 'ESEF', 'FOP', 'ICB', 'FENSG', 'Campus Garanhuns', 'Campus Petrolina', 'Campus Caruaru']
+CIDADES = ['Recife', 'Olinda', 'Caruaru', 'Petrolina', 'Garanhuns', 'Nazaré da Mata', 'Arcoverde', 'Salgueiro', 'Serra Talhada']
+
+
+def make_dataset(rows: int, seed: int = 0) -> pd.DataFrame:
+    """DataFrame no formato das abas 'pós lato sensu' + 'inov' concatenadas (1/3 Pós, 2/3 Inovação)."""
+    rnd = random.Random(seed)
+    n_pos = rows // 3
+    n_inov = rows - n_pos
+    pos = pd.DataFrame({
+        'UNIDADE PÓS': [rnd.choice(UNIDADES) for _ in range(n_pos)],
+        'DENOMINAÇÃO PÓS': [f'Especialização {i}' for i in range(n_pos)],
+        'STATUS DO CURSO PÓS': [rnd.choice(['EM ANDAMENTO', 'CONCLUÍDO', 'PREVISTO']) for _ in range(n_pos)],
+        'ALUNOS MATRICULADOS PÓS': [str(rnd.randint(0, 120)) for _ in range(n_pos)],
+    })
+    inov = pd.DataFrame({
+        'ANO INOV': [str(rnd.randint(2015, 2025)) for _ in range(n_inov)],
+        'UNIDADE': [rnd.choice(UNIDADES) for _ in range(n_inov)],
+        'VIA INOV': [rnd.choice(['IAUPE', 'UPE', 'RESITEC', 'FACEPE']) for _ in range(n_inov)],
+        'CIDADE': [rnd.choice(CIDADES) for _ in range(n_inov)],
+        'NATUREZA INOV': [rnd.choice(['PD&I', 'RESITEC', 'Extensão Tecnológica', 'Consultoria']) for _ in range(n_inov)],
+        'PROJETO': [f'Projeto {i}' for i in range(n_inov)],
+    })
+    return pd.concat([pos, inov], ignore_index=True, sort=False)
+
+
+class CallCounter:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts: Dict[str, int] = {}
+
+    def wrap(self, name: str, fn):
+        def wrapper(*args, **kwargs):
+            with self._lock:
+                self.counts[name] = self.counts.get(name, 0) + 1
+            return fn(*args, **kwargs)
+        return wrapper
+
+
+def run_session(index: int, args: argparse.Namespace, barrier: threading.Barrier) -> Dict:
+    from streamlit.testing.v1 import AppTest
+
+    rnd = random.Random(args.seed + index)
+    at = AppTest.from_file(str(ROOT / 'app.py'), default_timeout=args.timeout)
+    result = {'first': None, 'reruns': [], 'errors': 0}
+
+    barrier.wait()
+    start = time.perf_counter()
+    at.run()
+    result['first'] = time.perf_counter() - start
+    result['errors'] += len(at.exception)
+
+    for _ in range(args.steps):
+        if args.think:
+            time.sleep(rnd.uniform(0, args.think))
+        action = rnd.random()
+        try:
+            if action < 0.4:
+                box = at.selectbox(key='unidade_pos')
+                box.set_value(rnd.choice(box.options))
+            elif action < 0.8:
+                box = at.selectbox(key='ano_inov')
+                box.set_value(rnd.choice(box.options))
+            else:
+                at.selectbox(key='unidade_pos').set_value('Todos')
+                at.selectbox(key='ano_inov').set_value('Todos')
+        except KeyError:
+            # filtro ausente (coluna não encontrada): apenas rerun
+            pass
+        start = time.perf_counter()
+        at.run()
+        result['reruns'].append(time.perf_counter() - start)
+        result['errors'] += len(at.exception)
+    return result
+
+
+def _percentiles(values: List[float]) -> Dict[str, float]:
+    if not values:
+        return {}
+    arr = np.asarray(values) * 1000
+    out = {f'p{p}': round(float(np.percentile(arr, p)), 1) for p in (50, 90, 95, 99)}
+    out['max'] = round(float(arr.max()), 1)
+    return out
+
+
+def _peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa em KB, macOS em bytes
+    return round(peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024, 1)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--sessions', type=int, default=50, help='sessões simultâneas')
+    parser.add_argument('--steps', type=int, default=10, help='mudanças de filtro por sessão')
+    parser.add_argument('--rows', type=int, default=5000, help='linhas do dataset sintético')
+    parser.add_argument('--source', choices=['sheets', 'csv'], default='sheets')
+    parser.add_argument('--sheet-latency', type=float, default=0.5, help='latência simulada da API (s)')
+    parser.add_argument('--think', type=float, default=0.0, help='pausa máxima entre ações (s)')
+    parser.add_argument('--timeout', type=float, default=300.0, help='timeout de cada rerun (s)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--lenient-payload', action='store_true', help='não falha quando uma aba excede o orçamento de payload')
+    parser.add_argument('--tracemalloc', action='store_true', help='mede o pico do heap Python (mais lento)')
+    parser.add_argument('--json', help='grava o relatório neste arquivo')
+    args = parser.parse_args()
+
+    dataset = make_dataset(args.rows, args.seed)
+    counter = CallCounter()
+    patches = []
+    csv_path = None
+
+    if args.source == 'sheets':
+        os.environ['GOOGLE_SERVICE_ACCOUNT_FILE'] = 'stand-in.json'
+
+        def fake_fetch(*_args, **_kwargs):
+            time.sleep(args.sheet_latency)
+            return dataset.copy()
+
+        patches.append(mock.patch.object(busca_dados, 'fetch_coord_data', counter.wrap('fetch_coord_data', fake_fetch)))
+    else:
+        os.environ.pop('GOOGLE_SERVICE_ACCOUNT_FILE', None)
+        tmp = tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False, encoding='utf-8')
+        dataset.to_csv(tmp, sep=';', index=False)
+        tmp.close()
+        csv_path = tmp.name
+        os.environ['DADOS_CSV'] = csv_path
+
+        def offline(*_args, **_kwargs):
+            raise ConnectionError('load test: rede desativada')
+
+        patches.append(mock.patch('requests.get', counter.wrap('requests.get', offline)))
+        patches.append(mock.patch('pandas.read_csv', counter.wrap('read_csv', pd.read_csv)))
+
+    if not args.lenient_payload:
+        patches.append(mock.patch.object(figures, 'STRICT_PAYLOAD', True))
+
+    for p in patches:
+        p.start()
+    if args.tracemalloc:
+        tracemalloc.start()
+
+    barrier = threading.Barrier(args.sessions)
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=args.sessions) as pool:
+            results = list(pool.map(lambda i: run_session(i, args, barrier), range(args.sessions)))
+    finally:
+        for p in patches:
+            p.stop()
+        if csv_path is not None:
+            os.environ.pop('DADOS_CSV', None)
+            os.unlink(csv_path)
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+
+    reruns = [t for r in results for t in r['reruns']]
+    report = {
+        'sessions': args.sessions,
+        'steps': args.steps,
+        'rows': args.rows,
+        'source': args.source,
+        'first_load_ms': _percentiles([r['first'] for r in results]),
+        'rerun_ms': _percentiles(reruns),
+        'reruns_per_s': round(len(reruns) / wall, 2) if wall else None,
+        'errors': sum(r['errors'] for r in results),
+        'strict_payload': not args.lenient_payload,
+        'wall_s': round(wall, 2),
+        'cpu_s': round(cpu, 2),
+        'cpu_percent': round(100 * cpu / wall, 1) if wall else None,
+        'peak_rss_mb': _peak_rss_mb(),
+        'loader_calls': counter.counts,
+    }
+    if args.tracemalloc:
+        report['peak_python_heap_mb'] = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 1)
+        tracemalloc.stop()
+
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding='utf-8')
+
+
+if __name__ == '__main__':
+    main()